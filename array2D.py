@@ -12,14 +12,32 @@ Coordinate System:
 Classes:
 - Point: Represents a coordinate with optional data of any type
 - Array2D: 2D grid of coordinates and data with fast lookup
+- BitArray2D: Array2D of booleans packed one bit per cell
+- HashLife: Unbounded Life-like universe advanced 2^k generations at a time
+- PrefixSums: Summed-area table for O(1) rectangle sums
 - Direction: Enum for cardinal directions
 """
 
 from __future__ import annotations
+import math
+import mmap
+import operator
+import os
+import sys
+from array import array, typecodes
 from enum import Enum
+from heapq import heappop, heappush
+from collections import Counter, deque
+from collections.abc import Mapping
+from itertools import chain, islice, repeat
 from typing import Tuple
 from warnings import warn
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class Direction(Enum):
     """Four cardinal directions. Should be self-explanatory."""
 
@@ -29,6 +47,8 @@ class Direction(Enum):
     RIGHT = 'right'
 
 class Point:
+
+    __slots__ = ('_xyPair', '_data')
     
     def __init__(self, xyPair: Tuple[int,int], data=None) -> None:
         """Initialize Point with optional data storage"""
@@ -125,173 +145,3082 @@ class Point:
             case _:
                 warn("ERROR: No direction specified. Point was not moved.")
 
-class Array2D:
-    
-    
-    def __init__(self, cols: int, rows: int, defaultData=None, wrapX=False, wrapY=False) -> None:
-        """Initialize 2D array with immutable coordinates, no gaps or overlap allowed"""
-        
-        if cols < 1 or rows < 1: raise Exception("Cannot initiate an Array2D with less than 1 row and/or column")
+_COMPARISONS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+_NEIGHBOR_OFFSETS = {
+    4: ((0,-1), (1,0), (0,1), (-1,0)),
+    8: ((0,-1), (1,-1), (1,0), (1,1), (0,1), (-1,1), (-1,0), (-1,-1)),
+}
+
+class _Storage:
+    """Base for Array2D cell storage. Cells are read and written with (x, y) keys like a dict,
+    raising KeyError for coordinates out of range, and are always visited in row-major order"""
+
+    name = ''
+
+    def __init__(self, cols: int, rows: int, defaultData=None) -> None:
+        """Remember the dimensions every storage needs to translate coordinates"""
+
+        self.cols = cols
+        self.rows = rows
+        self.defaultData = defaultData
+
+    def _index(self, xyPair: Tuple[int,int]) -> int:
+        """Return flat row-major index (y * cols + x) of in-range coordinates, raise KeyError otherwise"""
 
         try:
-            self._rows = rows
-            self._cols = cols
-            self._wrapX = wrapX
-            self._wrapY = wrapY
-            self._matrix = {
-                (i,j): defaultData
-                for j in range(rows)
-                for i in range(cols)
-            }
-        except Exception as e:
-            print(f'ERROR: {e}')
+            x, y = xyPair
+            if 0 <= x < self.cols and 0 <= y < self.rows: return y * self.cols + x
+        except (TypeError, ValueError):
+            pass
+        raise KeyError(xyPair)
 
-    
-    def __repr__(self) -> str:
-        """Basic data for debugging"""
+    def __contains__(self, xyPair) -> bool:
+        """Check whether coordinates are in range"""
+
+        try:
+            self._index(xyPair)
+            return True
+        except KeyError:
+            return False
+
+    def __len__(self) -> int:
+        """Number of cells"""
+
+        return self.cols * self.rows
+
+    def keys(self):
+        """Yields every coordinate in row-major order"""
+
+        for j in range(self.rows):
+            for i in range(self.cols):
+                yield (i,j)
 
-        return f'Array2D({self._rows}x{self._cols})'
-    
-    
     def __iter__(self):
-        """Yields all dictionary entries of this Array2D as Points, iterates over rows (left to right, then down at end of row)"""
+        """Iterating storage yields coordinates, as a dict would"""
 
-        for coord, data in self._matrix.items():
-            yield Point(coord,data)
-    
-    
-    def iterLocs(self, cols: None | int | list[int] = None, rows: None | int | list[int] = None, transpose: bool = False):
-        """Yields the x, y tuple in row-iterating order for the given cols and rows, iterates over entire Array2D if cols/rows unspecified.
-        No values iterates all points in Array2D. transpose = True iterates over columns instead of rows"""
+        return self.keys()
 
-        giveWarning = True
+    def values(self):
+        """Yields every cell value in row-major order"""
 
-        if isinstance(cols, int): cols = [cols]
-        if isinstance(rows, int): rows = [rows]
+        for coord in self.keys():
+            yield self[coord]
 
-        if cols == None: cols = [i for i in range(self._cols)]
-        if rows == None: rows = [i for i in range(self._rows)]
+    def items(self):
+        """Yields (coordinates, value) pairs in row-major order"""
 
-        if not (isinstance(cols, list) and isinstance(rows, list)):
-            raise Exception("Invalid argument type, expected int or list of ints for cols and rows. No iterator function returned.")
-        try:
-            if not transpose:
-                for j in rows:
-                    for i in cols:
-                        if i < self._cols and j < self._rows:
-                            yield (i,j)
-                        else:
-                            if giveWarning: warn("ERROR: At least one listed row/column was out of range of the source matrix. Returning only coordinates within matrix bounds.")
-                            giveWarning = False
+        for coord in self.keys():
+            yield coord, self[coord]
+
+    def toList(self) -> list:
+        """Return a new flat row-major list of all cell values"""
+
+        return list(self.values())
+
+    def loadList(self, values: list) -> None:
+        """Overwrite every cell from a flat row-major list of values"""
+
+        for coord, value in zip(self.keys(), values):
+            self[coord] = value
+
+    def like(self) -> Tuple[str, dict]:
+        """Return storage name and constructor options for building an in-memory storage of the same kind"""
+
+        return self.name, {}
+
+    def flush(self) -> None:
+        """Persist pending writes, a no-op for storage that lives only in memory"""
+
+        pass
+
+    def rawBuffer(self) -> memoryview | None:
+        """Return a zero-copy view of the underlying cell buffer, None when cells are Python objects"""
+
+        return None
+
+    def find(self, data) -> list[Tuple[int,int]]:
+        """Return coordinates of all cells holding any of the given values"""
+
+        return [coord for coord, value in self.items() if value in data]
+
+    def count(self, data) -> int:
+        """Return number of cells holding data"""
+
+        return sum(1 for value in self.values() if value is data or value == data)
+
+    def first(self, data) -> Tuple[int,int] | None:
+        """Return the first coordinates in row-major order holding data, None if there are none"""
+
+        for coord, value in self.items():
+            if value is data or value == data: return coord
+        return None
+
+    def where(self, predicate, x0: int, y0: int, x1: int, y1: int):
+        """Yields coordinates in row-major order within columns x0 up to x1 and rows y0 up to y1 whose value satisfies
+        predicate, a callable or an (operator, value) comparison tuple"""
+
+        if isinstance(predicate, tuple):
+            compare, operand = _COMPARISONS[predicate[0]], predicate[1]
+            predicate = lambda value: compare(value, operand)
+        for j in range(y0, y1):
+            for i, value in enumerate(self.getSpan(j, x0, x1), x0):
+                if predicate(value): yield (i,j)
+
+    def select(self, cols: list[int] | None, rows: list[int] | None):
+        """Yields values of the given in-range cols of the given in-range rows (all if None), row by row"""
+
+        for j in range(self.rows) if rows is None else rows:
+            row = self.getSpan(j, 0, self.cols)
+            if cols is None:
+                yield from row
             else:
-                for i in cols:
-                    for j in rows:
-                        if i < self._cols and j < self._rows:
-                            yield (i,j)
-                        else:
-                            if giveWarning: warn("ERROR: At least one listed row/column was out of range of the source matrix. Returning only coordinates within matrix bounds.")
-                            giveWarning = False
-        except Exception as e:
-            print(f'ERROR: {e}')
+                yield from (row[i] for i in cols)
 
-    def getData(self, xyPair: Tuple[int,int] | list[Tuple[int,int]]):
-        """Pull data from point at given coordinates. Returns list of data if list of tuple(x,y) provided. Returns None for coordinates out of range of array"""
+    def aggregate(self, operation: str, cols: list[int] | None = None, rows: list[int] | None = None):
+        """Reduce the selected cells in one pass. operation is 'counts' (dict of value to count), 'sum', 'min' or 'max'"""
 
-        if isinstance(xyPair, tuple):
+        values = self.values() if cols is None and rows is None else self.select(cols, rows)
+        match operation:
+            case 'counts':
+                return dict(Counter(values))
+            case 'sum':
+                return sum(values)
+            case 'min':
+                return min(values)
+            case 'max':
+                return max(values)
+
+    def fill(self, data) -> None:
+        """Write data to every cell"""
+
+        for coord in self.keys():
+            self[coord] = data
+
+    def setMany(self, coords, data) -> bool:
+        """Write data to each listed coordinate, returns False if any were out of range"""
+
+        inRange = True
+        for coord in coords:
             try:
-                return self._matrix[xyPair]
+                self[coord] = data
             except KeyError:
-                warn("ERROR: Given coordinates are out of range. Returning None.")
-                return None
-        elif (isinstance(xyPair, list) and all(isinstance(p, tuple) and len(p) == 2 for p in xyPair)):
-            dataList = []
-            giveWarning = True
-            for pair in xyPair:
-                try:
-                    dataList.append(self._matrix[pair])
-                except KeyError:
-                    dataList.append(None)
-                    if giveWarning: warn("ERROR: At least one coordinate was out of range of matrix. Returning None for data of invalid coordinates.")
-                    giveWarning = False
-            return dataList
-        else:
-            warn("ERROR: Passed an invalid argument type, expected Tuple[int,int] or list of Tuple[int,int]. Returning None.")
-            return None
+                inRange = False
+        return inRange
 
-    def setData(self, xyPair: Tuple[int,int] | list[Tuple[int,int]], data) -> None:
-        """Update data for given coordinates"""
-        
-        giveWarning = False
-        if isinstance(xyPair,tuple): xyPair = [xyPair]
+    def getSpan(self, y: int, x0: int, x1: int) -> list:
+        """Return values of row y from column x0 up to x1, which the caller keeps in range"""
 
-        if not (isinstance(xyPair, list) and all(isinstance(p, tuple) and len(p) == 2 for p in xyPair)):
-            raise Exception("ERROR: Passed an invalid argument type, expected Tuple[int,int] or list of Tuple[int,int]. No data updates completed")
+        return [self[(i,y)] for i in range(x0, x1)]
 
-        try:
-            for coord in xyPair:
-                if coord in self._matrix:
-                    self._matrix[coord] = data
-                else:
-                    giveWarning = True
-        except Exception as e:
-            print(f'ERROR: {e}')
-        
-        if giveWarning: warn("ERROR: Some listed rows/columns were out of range of the target matrix. Updating data only for coordinates within matrix bounds.")
+    def setSpan(self, y: int, x0: int, values: list) -> None:
+        """Write a list of values into row y starting at column x0, which the caller keeps in range"""
 
-    def loadFrom(self, point: Point) -> None:
-        """Assign data from a given point directly to same coordinates on the matrix"""
+        for i, value in enumerate(values, x0):
+            self[(i,y)] = value
 
-        try:
-            self._matrix[point.getPos()] = point.getData()
-        except KeyError:
-            warn("ERROR: Given point is out of range of this matrix. Matrix data was not updated.")
+    def fillSpan(self, y: int, x0: int, x1: int, data) -> None:
+        """Write data to row y from column x0 up to x1, which the caller keeps in range"""
 
-    def saveTo(self, point: Point) -> None:
-        """Assign data from a matrix point to another Point object with the same coordinates"""
-        try:
-            point.setData(self._matrix[point.getPos()])
-        except KeyError:
-            warn("ERROR: Given point is out of range of this matrix. Point data was not updated.")
+        for i in range(x0, x1):
+            self[(i,y)] = data
 
-    def findAny(self, *data) -> list[Tuple[int,int]]:
-        """Return all coordinates containing specific piece(s) of data"""
+class _DictStorage(dict, _Storage):
+    """Original storage, a dict keyed by (x, y) tuples. Lookups are a single hash but every cell costs a tuple and a dict slot"""
 
-        dataList = []
-        for key, value in self._matrix.items():
-            if value in data: dataList.append(key)
-        return dataList
-    
-    def asPoint(self, xyPair: Tuple[int,int]) -> Point | None:
-        """Returns the requested coordinates as a full Point class"""
+    name = 'dict'
+
+    def __init__(self, cols: int, rows: int, defaultData=None) -> None:
+        """Build one dict entry per cell in row-major order"""
+
+        super().__init__(((i,j), defaultData) for j in range(rows) for i in range(cols))
+        _Storage.__init__(self, cols, rows, defaultData)
+
+    def toList(self) -> list:
+        """Return a new flat row-major list of all cell values"""
+
+        return list(dict.values(self))
+
+    def loadList(self, values: list) -> None:
+        """Overwrite every cell from a flat row-major list of values"""
+
+        self.update(zip(self.keys(), values))
+
+    def fillSpan(self, y: int, x0: int, x1: int, data) -> None:
+        """Write data to row y from column x0 up to x1, which the caller keeps in range"""
+
+        self.update(dict.fromkeys(zip(range(x0, x1), repeat(y)), data))
+
+    def fill(self, data) -> None:
+        """Write data to every cell"""
+
+        self.update(dict.fromkeys(self, data))
+
+    def setMany(self, coords, data) -> bool:
+        """Write data to each listed coordinate, returns False if any were out of range"""
+
+        inRange = True
+        for coord in coords:
+            if coord in self:
+                self[coord] = data
+            else:
+                inRange = False
+        return inRange
+
+class _ListStorage(_Storage):
+    """Dense storage, a single row-major list indexed by y * cols + x. Costs one pointer per cell"""
+
+    name = 'dense'
+
+    def __init__(self, cols: int, rows: int, defaultData=None) -> None:
+        """Build every cell with a single list multiplication"""
+
+        super().__init__(cols, rows, defaultData)
+        self._cells = [defaultData] * (cols * rows)
+
+    def __getitem__(self, xyPair: Tuple[int,int]):
+        return self._cells[self._index(xyPair)]
+
+    def __setitem__(self, xyPair: Tuple[int,int], data) -> None:
+        self._cells[self._index(xyPair)] = data
+
+    def values(self):
+        """Yields every cell value in row-major order"""
+
+        return iter(self._cells)
+
+    def items(self):
+        """Yields (coordinates, value) pairs in row-major order"""
+
+        cols = self.cols
+        cells = self._cells
+        for j in range(self.rows):
+            start = j * cols
+            for i, value in enumerate(cells[start:start + cols]):
+                yield (i,j), value
+
+    def toList(self) -> list:
+        """Return a new flat row-major list of all cell values"""
+
+        return list(self._cells)
+
+    def loadList(self, values: list) -> None:
+        """Overwrite every cell from a flat row-major list of values"""
+
+        self._cells[:] = values
+
+    def fill(self, data) -> None:
+        """Write data to every cell in place"""
+
+        self._cells[:] = [data] * len(self._cells)
+
+    def getSpan(self, y: int, x0: int, x1: int) -> list:
+        """Return values of row y from column x0 up to x1 as one slice"""
+
+        start = y * self.cols
+        return list(self._cells[start + x0:start + x1])
+
+    def setSpan(self, y: int, x0: int, values: list) -> None:
+        """Write a list of values into row y starting at column x0 as one slice assignment"""
+
+        start = y * self.cols + x0
+        self._cells[start:start + len(values)] = self._pack(values)
+
+    def fillSpan(self, y: int, x0: int, x1: int, data) -> None:
+        """Write data to row y from column x0 up to x1 as one slice assignment"""
+
+        start = y * self.cols
+        self._cells[start + x0:start + x1] = self._pack([data]) * (x1 - x0)
+
+    def _pack(self, values: list):
+        """Convert a list of values to the cell sequence's own type for slice assignment"""
+
+        return values
+
+    @staticmethod
+    def _scan(cells, data, offset: int = 0) -> list[int]:
+        """Return flat indices (shifted by offset) of cells holding any of the given values, scanning with the sequence's own index()"""
+
+        found = []
+        for value in data:
+            i = -1
+            try:
+                while True:
+                    i = cells.index(value, i + 1)
+                    found.append(offset + i)
+            except ValueError:
+                pass
+        return found
+
+    def _toCoords(self, found: list[int], data) -> list[Tuple[int,int]]:
+        """Turn flat indices from _scan into row-major ordered coordinates"""
+
+        if len(data) > 1: found = sorted(set(found))
+        cols = self.cols
+        return [(i % cols, i // cols) for i in found]
+
+    def find(self, data) -> list[Tuple[int,int]]:
+        """Return coordinates of all cells holding any of the given values"""
+
+        return self._toCoords(self._scan(self._cells, data), data)
+
+    def count(self, data) -> int:
+        """Return number of cells holding data"""
+
+        return self._cells.count(data)
+
+    def first(self, data) -> Tuple[int,int] | None:
+        """Return the first coordinates in row-major order holding data, None if there are none"""
 
         try:
-            return Point(xyPair,self._matrix[xyPair])
-        except KeyError:
-            warn("ERROR: Given coordinates are out of range. Returning None.")
+            i = self._cells.index(data)
+        except ValueError:
             return None
+        return (i % self.cols, i // self.cols)
 
-    @property
-    def rows(self) -> int:
-        """Return number of rows in matrix"""
+class _TypedStorage(_ListStorage):
+    """Compact numeric storage, a row-major array.array of the given typecode (e.g. 'i', 'q', 'd'),
+    costing the typecode's item size per cell instead of a boxed Python object"""
 
-        return self._rows 
+    name = 'typed'
 
-    @property
-    def cols(self) -> int:
-        """Return number of columns in matrix"""
+    def __init__(self, cols: int, rows: int, defaultData=None, dtype: str = 'i') -> None:
+        """Build every cell with a single array multiplication, defaultData of None becomes 0"""
 
-        return self._cols
-    
-    @property
-    def wrapX(self) -> bool:
-        """Returns whether matrix can wrap around for Point x-movement"""
+        _Storage.__init__(self, cols, rows, 0 if defaultData is None else defaultData)
+        self._cells = array(dtype, [self.defaultData]) * (cols * rows)
+
+    def rawBuffer(self) -> memoryview:
+        """Return a zero-copy view of the underlying array"""
+
+        return memoryview(self._cells)
+
+    def loadList(self, values: list) -> None:
+        """Overwrite every cell in place from a flat row-major list of values"""
+
+        self._cells[:] = array(self.dtype, values)
+
+    def like(self) -> Tuple[str, dict]:
+        """Return storage name and constructor options for building an in-memory storage of the same kind"""
+
+        return 'typed', {'dtype': self.dtype}
+
+    def _pack(self, values: list) -> array:
+        """Convert a list of values to an array of the storage's typecode for slice assignment"""
+
+        return array(self.dtype, values)
+
+    def fill(self, data) -> None:
+        """Write data to every cell in place, keeping any exported buffers valid"""
+
+        self._cells[:] = array(self.dtype, [data]) * len(self._cells)
 
-        return self._wrapX
-    
     @property
-    def wrapY(self) -> bool:
-        """Returns whether matrix can wrap around for Point y-movement"""
-        
-        return self._wrapY
+    def dtype(self) -> str:
+        """Typecode of the underlying array"""
+
+        return self._cells.typecode
+
+class _NumpyStorage(_Storage):
+    """NumPy storage, an ndarray of shape (rows, cols) so bulk writes, fills and lookups run vectorized.
+    Object arrays holding any value are used unless a dtype is given"""
+
+    name = 'numpy'
+
+    def __init__(self, cols: int, rows: int, defaultData=None, dtype=None) -> None:
+        """Build every cell with a single broadcast assignment"""
+
+        if dtype is not None and defaultData is None: defaultData = 0
+        super().__init__(cols, rows, defaultData)
+        self._array = np.empty((rows, cols), dtype=object if dtype is None else dtype)
+        self._array[...] = self._cell(defaultData)
+
+    def _cell(self, data):
+        """Return data ready to assign to many cells. Object arrays get it wrapped in a 0-d array so that sequences
+        are stored whole instead of being spread across the cells"""
+
+        if self._array.dtype != object: return data
+        holder = np.empty((), dtype=object)
+        holder[()] = data
+        return holder
+
+    def _column(self, values: list):
+        """Return a list of values ready to assign to a run of cells, one value per cell even for sequences"""
+
+        if self._array.dtype != object: return values
+        return np.fromiter(values, dtype=object, count=len(values))
+
+    def __getitem__(self, xyPair: Tuple[int,int]):
+        self._index(xyPair)
+        return self._array.item(xyPair[1], xyPair[0])
+
+    def __setitem__(self, xyPair: Tuple[int,int], data) -> None:
+        self._index(xyPair)
+        self._array[xyPair[1], xyPair[0]] = data
+
+    def values(self):
+        """Yields every cell value in row-major order"""
+
+        for row in self._array:
+            yield from row.tolist()
+
+    def items(self):
+        """Yields (coordinates, value) pairs in row-major order"""
+
+        for j, row in enumerate(self._array):
+            for i, value in enumerate(row.tolist()):
+                yield (i,j), value
+
+    def toList(self) -> list:
+        """Return a new flat row-major list of all cell values"""
+
+        return self._array.ravel().tolist()
+
+    def loadList(self, values: list) -> None:
+        """Overwrite every cell from a flat row-major list of values"""
+
+        self._array[...] = np.asarray(self._column(values), dtype=self._array.dtype).reshape(self.rows, self.cols)
+
+    def like(self) -> Tuple[str, dict]:
+        """Return storage name and constructor options for building an in-memory storage of the same kind"""
+
+        return 'numpy', {} if self._array.dtype == object else {'dtype': self._array.dtype}
+
+    def rawBuffer(self) -> memoryview | None:
+        """Return a zero-copy view of the ndarray, None for object arrays"""
+
+        return None if self._array.dtype == object else memoryview(self._array)
+
+    def fill(self, data) -> None:
+        """Write data to every cell"""
+
+        self._array[...] = self._cell(data)
+
+    def getSpan(self, y: int, x0: int, x1: int) -> list:
+        """Return values of row y from column x0 up to x1"""
+
+        return self._array[y, x0:x1].tolist()
+
+    def setSpan(self, y: int, x0: int, values: list) -> None:
+        """Write a list of values into row y starting at column x0"""
+
+        self._array[y, x0:x0 + len(values)] = self._column(values)
+
+    def fillSpan(self, y: int, x0: int, x1: int, data) -> None:
+        """Write data to row y from column x0 up to x1"""
+
+        self._array[y, x0:x1] = self._cell(data)
+
+    def find(self, data) -> list[Tuple[int,int]]:
+        """Return coordinates of all cells holding any of the given values using a vectorized equality mask"""
+
+        if self._array.dtype == object or not all(np.ndim(value) == 0 for value in data):
+            return super().find(data)
+        mask = np.zeros(self._array.shape, dtype=bool)
+        for value in data:
+            mask |= self._array == value
+        ys, xs = np.nonzero(mask)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    _WHERE_ROWS = 64
+
+    def where(self, predicate, x0: int, y0: int, x1: int, y1: int):
+        """Yields coordinates in row-major order whose value satisfies predicate. Comparison tuples on numeric arrays are
+        evaluated as vectorized masks a band of rows at a time, so stopping early skips the remaining bands"""
+
+        if not isinstance(predicate, tuple) or self._array.dtype == object:
+            yield from super().where(predicate, x0, y0, x1, y1)
+            return
+
+        compare, operand = _COMPARISONS[predicate[0]], predicate[1]
+        for start in range(y0, y1, self._WHERE_ROWS):
+            ys, xs = np.nonzero(compare(self._array[start:min(start + self._WHERE_ROWS, y1), x0:x1], operand))
+            yield from zip((xs + x0).tolist(), (ys + start).tolist())
+
+    def aggregate(self, operation: str, cols: list[int] | None = None, rows: list[int] | None = None):
+        """Reduce the selected cells with vectorized NumPy reductions. operation is 'counts', 'sum', 'min' or 'max'"""
+
+        if self._array.dtype == object: return super().aggregate(operation, cols, rows)
+        selected = self._array
+        if rows is not None: selected = selected[rows, :]
+        if cols is not None: selected = selected[:, cols]
+        match operation:
+            case 'counts':
+                found, counts = np.unique(selected, return_counts=True)
+                return dict(zip(found.tolist(), counts.tolist()))
+            case 'sum':
+                return selected.sum().item()
+            case 'min':
+                return selected.min().item()
+            case 'max':
+                return selected.max().item()
+
+    def count(self, data) -> int:
+        """Return number of cells holding data using a vectorized equality mask"""
 
+        if self._array.dtype == object or np.ndim(data) != 0: return super().count(data)
+        return int(np.count_nonzero(self._array == data))
+
+    def setMany(self, coords, data) -> bool:
+        """Write data to each listed coordinate with one fancy-indexed assignment, returns False if any were out of range"""
+
+        if not coords: return True
+        xs, ys = np.asarray(coords, dtype=np.intp).T
+        inRange = (xs >= 0) & (xs < self.cols) & (ys >= 0) & (ys < self.rows)
+        self._array[ys[inRange], xs[inRange]] = self._cell(data)
+        return bool(inRange.all())
+
+    @property
+    def dtype(self):
+        """dtype of the underlying ndarray"""
+
+        return self._array.dtype
+
+class _SparseStorage(_Storage):
+    """Sparse storage, a dict holding only cells that differ from defaultData keyed by flat index.
+    Construction is O(1) and unset in-range cells read back as defaultData"""
+
+    name = 'sparse'
+
+    def __init__(self, cols: int, rows: int, defaultData=None) -> None:
+        """Start with no stored cells"""
+
+        super().__init__(cols, rows, defaultData)
+        self._cells = {}
+
+    def _isDefault(self, data) -> bool:
+        """Check whether data is defaultData (equal and of the same type) and so need not be stored"""
+
+        return data is self.defaultData or (type(data) is type(self.defaultData) and data == self.defaultData)
+
+    def __getitem__(self, xyPair: Tuple[int,int]):
+        return self._cells.get(self._index(xyPair), self.defaultData)
+
+    def __setitem__(self, xyPair: Tuple[int,int], data) -> None:
+        i = self._index(xyPair)
+        if self._isDefault(data):
+            self._cells.pop(i, None)
+        else:
+            self._cells[i] = data
+
+    def values(self):
+        """Yields every cell value in row-major order"""
+
+        get = self._cells.get
+        default = self.defaultData
+        for i in range(self.cols * self.rows):
+            yield get(i, default)
+
+    def items(self):
+        """Yields (coordinates, value) pairs in row-major order"""
+
+        get = self._cells.get
+        default = self.defaultData
+        i = 0
+        for j in range(self.rows):
+            for k in range(self.cols):
+                yield (k,j), get(i, default)
+                i += 1
+
+    def toList(self) -> list:
+        """Return a new flat row-major list of all cell values"""
+
+        cells = [self.defaultData] * (self.cols * self.rows)
+        for i, value in self._cells.items():
+            cells[i] = value
+        return cells
+
+    def loadList(self, values: list) -> None:
+        """Overwrite every cell from a flat row-major list of values, keeping only non-default ones"""
+
+        self._cells = {i: value for i, value in enumerate(values) if not self._isDefault(value)}
+
+    def fill(self, data) -> None:
+        """Write data to every cell, filling with defaultData frees all stored cells"""
+
+        self._cells = {} if self._isDefault(data) else dict.fromkeys(range(self.cols * self.rows), data)
+
+    def count(self, data) -> int:
+        """Return number of cells holding data, counting unstored cells arithmetically"""
+
+        stored = sum(1 for value in self._cells.values() if value is data or value == data)
+        if data is self.defaultData or data == self.defaultData: stored += self.cols * self.rows - len(self._cells)
+        return stored
+
+    def aggregate(self, operation: str, cols: list[int] | None = None, rows: list[int] | None = None):
+        """Reduce the selected cells. Over the whole grid only stored cells are visited and unstored ones are
+        accounted for as a single run of defaultData"""
+
+        unstored = self.cols * self.rows - len(self._cells)
+        if cols is not None or rows is not None or not unstored: return super().aggregate(operation, cols, rows)
+        stored = self._cells.values()
+        match operation:
+            case 'counts':
+                counts = Counter(stored)
+                counts[self.defaultData] += unstored
+                return dict(counts)
+            case 'sum':
+                return sum(stored) + self.defaultData * unstored
+            case 'min':
+                return min(chain(stored, [self.defaultData]))
+            case 'max':
+                return max(chain(stored, [self.defaultData]))
+
+    def find(self, data) -> list[Tuple[int,int]]:
+        """Return coordinates of all cells holding any of the given values. Only stored cells are scanned
+        unless defaultData is searched for, in which case every unstored cell is taken as a match"""
+
+        cells = self._cells
+        if self.defaultData in data:
+            found = [i for i in range(self.cols * self.rows) if i not in cells or cells[i] in data]
+        else:
+            found = sorted(i for i, value in cells.items() if value in data)
+        cols = self.cols
+        return [(i % cols, i // cols) for i in found]
+
+class _TiledStorage(_Storage):
+    """Tiled storage, the plane split into tileSize x tileSize row-major tiles found through a tile directory.
+    Every tile starts as one shared immutable default tile and is only copied into its own list on first write"""
+
+    name = 'tiled'
+
+    def __init__(self, cols: int, rows: int, defaultData=None, tileSize: int = 64) -> None:
+        """Point every directory entry at the shared default tile"""
+
+        if tileSize < 1: raise Exception("Cannot use a tileSize less than 1")
+        super().__init__(cols, rows, defaultData)
+        self.tileSize = tileSize
+        self._tilesX = -(-cols // tileSize)
+        self._defaultTile = (defaultData,) * (tileSize * tileSize)
+        self._tiles = [self._defaultTile] * (self._tilesX * -(-rows // tileSize))
+
+    def _locate(self, xyPair: Tuple[int,int]) -> Tuple[int,int]:
+        """Return (tile number, offset within tile) of in-range coordinates, raise KeyError otherwise"""
+
+        self._index(xyPair)
+        tx, ox = divmod(xyPair[0], self.tileSize)
+        ty, oy = divmod(xyPair[1], self.tileSize)
+        return ty * self._tilesX + tx, oy * self.tileSize + ox
+
+    def __getitem__(self, xyPair: Tuple[int,int]):
+        t, o = self._locate(xyPair)
+        return self._tiles[t][o]
+
+    def __setitem__(self, xyPair: Tuple[int,int], data) -> None:
+        t, o = self._locate(xyPair)
+        self._writableTile(t)[o] = data
+
+    def _rowSpans(self, y: int):
+        """Yields each tile's slice of row y from left to right"""
+
+        size = self.tileSize
+        ty, oy = divmod(y, size)
+        start = oy * size
+        tiles = self._tiles[ty * self._tilesX:(ty + 1) * self._tilesX]
+        for tile in tiles[:-1]:
+            yield tile[start:start + size]
+        yield tiles[-1][start:start + self.cols - (len(tiles) - 1) * size]
+
+    def values(self):
+        """Yields every cell value in row-major order"""
+
+        for j in range(self.rows):
+            for span in self._rowSpans(j):
+                yield from span
+
+    def items(self):
+        """Yields (coordinates, value) pairs in row-major order"""
+
+        for j in range(self.rows):
+            i = 0
+            for span in self._rowSpans(j):
+                for value in span:
+                    yield (i,j), value
+                    i += 1
+
+    def toList(self) -> list:
+        """Return a new flat row-major list of all cell values"""
+
+        cells = []
+        for j in range(self.rows):
+            for span in self._rowSpans(j):
+                cells.extend(span)
+        return cells
+
+    def like(self) -> Tuple[str, dict]:
+        """Return storage name and constructor options for building an in-memory storage of the same kind"""
+
+        return 'tiled', {'tileSize': self.tileSize}
+
+    def _tilePieces(self, y: int, x0: int, x1: int):
+        """Yields (tile number, start offset, span start, span end) for each tile that row y crosses between x0 and x1"""
+
+        size = self.tileSize
+        ty, oy = divmod(y, size)
+        x = x0
+        while x < x1:
+            tx, ox = divmod(x, size)
+            end = min(x1, (tx + 1) * size)
+            yield ty * self._tilesX + tx, oy * size + ox, x - x0, end - x0
+            x = end
+
+    def _writableTile(self, t: int) -> list:
+        """Return tile t, first copying it out of the shared default tile if needed"""
+
+        tile = self._tiles[t]
+        if tile is self._defaultTile:
+            tile = self._tiles[t] = list(tile)
+        return tile
+
+    def getSpan(self, y: int, x0: int, x1: int) -> list:
+        """Return values of row y from column x0 up to x1, one slice per tile crossed"""
+
+        values = []
+        for t, o, start, end in self._tilePieces(y, x0, x1):
+            values.extend(self._tiles[t][o:o + end - start])
+        return values
+
+    def setSpan(self, y: int, x0: int, values: list) -> None:
+        """Write a list of values into row y starting at column x0, one slice assignment per tile crossed"""
+
+        for t, o, start, end in self._tilePieces(y, x0, x0 + len(values)):
+            self._writableTile(t)[o:o + end - start] = values[start:end]
+
+    def fillSpan(self, y: int, x0: int, x1: int, data) -> None:
+        """Write data to row y from column x0 up to x1, one slice assignment per tile crossed"""
+
+        for t, o, start, end in self._tilePieces(y, x0, x1):
+            self._writableTile(t)[o:o + end - start] = [data] * (end - start)
+
+    def fill(self, data) -> None:
+        """Write data to every cell by pointing the whole directory at a new shared tile"""
+
+        self._defaultTile = (data,) * (self.tileSize * self.tileSize)
+        self._tiles = [self._defaultTile] * len(self._tiles)
+
+    def find(self, data) -> list[Tuple[int,int]]:
+        """Return coordinates of all cells holding any of the given values, skipping shared tiles that cannot match"""
+
+        size = self.tileSize
+        sharedMatch = self._defaultTile[0] in data
+        found = []
+        for t, tile in enumerate(self._tiles):
+            if tile is self._defaultTile and not sharedMatch: continue
+            x0 = t % self._tilesX * size
+            y0 = t // self._tilesX * size
+            for o, value in enumerate(tile):
+                x = x0 + o % size
+                y = y0 + o // size
+                if x < self.cols and y < self.rows and value in data: found.append((y, x))
+        found.sort()
+        return [(x, y) for y, x in found]
+
+    @property
+    def allocatedTiles(self) -> int:
+        """Number of tiles that have been written to and hold their own cells"""
+
+        return sum(1 for tile in self._tiles if tile is not self._defaultTile)
+
+class _MmapStorage(_TypedStorage):
+    """File-backed numeric storage, a memoryview cast over an mmap of a raw row-major binary file.
+    Pages load on demand, are shared between processes mapping the same file and writes go straight to the file"""
+
+    name = 'mmap'
+
+    _CHUNK = 1 << 16
+
+    def __init__(self, cols: int, rows: int, path: str, dtype: str = 'i', writable: bool = True) -> None:
+        """Map the file, which must hold exactly cols * rows items of dtype"""
+
+        _Storage.__init__(self, cols, rows, 0)
+        with open(path, 'r+b' if writable else 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            expected = cols * rows * array(dtype).itemsize
+            if size != expected: raise Exception(f"File holds {size} bytes but a {cols}x{rows} grid of '{dtype}' needs {expected}")
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        self._cells = memoryview(self._mmap).cast(dtype)
+
+    def _chunks(self):
+        """Yields (start index, array copy) for consecutive chunks of the file"""
+
+        for start in range(0, len(self._cells), self._CHUNK):
+            chunk = array(self.dtype)
+            chunk.frombytes(self._cells[start:start + self._CHUNK].cast('B'))
+            yield start, chunk
+
+    def find(self, data) -> list[Tuple[int,int]]:
+        """Return coordinates of all cells holding any of the given values, scanning the file in array-sized chunks"""
+
+        found = []
+        for start, chunk in self._chunks():
+            found += self._scan(chunk, data, start)
+        return self._toCoords(found, data)
+
+    def count(self, data) -> int:
+        """Return number of cells holding data, counting the file in array-sized chunks"""
+
+        return sum(chunk.count(data) for _, chunk in self._chunks())
+
+    def first(self, data) -> Tuple[int,int] | None:
+        """Return the first coordinates in row-major order holding data, None if there are none"""
+
+        for start, chunk in self._chunks():
+            try:
+                i = start + chunk.index(data)
+            except ValueError:
+                continue
+            return (i % self.cols, i // self.cols)
+        return None
+
+    def flush(self) -> None:
+        """Flush written pages to the file"""
+
+        self._mmap.flush()
+
+    @property
+    def dtype(self) -> str:
+        """Typecode of the mapped items"""
+
+        return self._cells.format
+
+class _PaletteStorage(_Storage):
+    """Palette storage, a table of the distinct values plus a compact row-major array of table indices per cell.
+    Indices start as one byte and widen to two, then four, as the table grows. Equal values of the same type share an entry"""
+
+    name = 'palette'
+
+    def __init__(self, cols: int, rows: int, defaultData=None) -> None:
+        """Start with defaultData as the only palette entry"""
+
+        super().__init__(cols, rows, defaultData)
+        self._palette = [defaultData]
+        self._lookup = {}
+        self._register(defaultData, 0)
+        self._cells = array('B', [0]) * (cols * rows)
+
+    def _register(self, data, code: int) -> None:
+        """Remember the index of a palette value when it is hashable"""
+
+        try:
+            self._lookup[(type(data), data)] = code
+        except TypeError:
+            pass
+
+    def _code(self, data, add: bool = True) -> int | None:
+        """Return the palette index of data, appending it to the palette (and widening indices if needed) when add is set"""
+
+        try:
+            return self._lookup[(type(data), data)]
+        except KeyError:
+            pass
+        except TypeError:
+            for code, value in enumerate(self._palette):
+                if type(value) is type(data) and value == data: return code
+        if not add: return None
+
+        code = len(self._palette)
+        self._palette.append(data)
+        self._register(data, code)
+        if code == 1 << 8 * self._cells.itemsize:
+            self._cells = array('H' if self._cells.typecode == 'B' else 'I', self._cells)
+        return code
+
+    def _matches(self, data) -> list[int]:
+        """Return the palette indices of every value equal to data, searches matching by equality like other storages"""
+
+        return [code for code, value in enumerate(self._palette) if value is data or value == data]
+
+    def __getitem__(self, xyPair: Tuple[int,int]):
+        return self._palette[self._cells[self._index(xyPair)]]
+
+    def __setitem__(self, xyPair: Tuple[int,int], data) -> None:
+        i = self._index(xyPair)
+        self._cells[i] = self._code(data)
+
+    def values(self):
+        """Yields every cell value in row-major order"""
+
+        return map(self._palette.__getitem__, self._cells)
+
+    def items(self):
+        """Yields (coordinates, value) pairs in row-major order"""
+
+        cols = self.cols
+        palette = self._palette
+        for j in range(self.rows):
+            start = j * cols
+            for i, code in enumerate(self._cells[start:start + cols]):
+                yield (i,j), palette[code]
+
+    def toList(self) -> list:
+        """Return a new flat row-major list of all cell values"""
+
+        return list(map(self._palette.__getitem__, self._cells))
+
+    def loadList(self, values: list) -> None:
+        """Overwrite every cell from a flat row-major list of values"""
+
+        codes = [self._code(value) for value in values]
+        self._cells = array(self._cells.typecode, codes)
+
+    def fill(self, data) -> None:
+        """Write data to every cell in place"""
+
+        code = self._code(data)
+        self._cells[:] = array(self._cells.typecode, [code]) * len(self._cells)
+
+    def getSpan(self, y: int, x0: int, x1: int) -> list:
+        """Return values of row y from column x0 up to x1, decoding one slice of indices"""
+
+        start = y * self.cols
+        return list(map(self._palette.__getitem__, self._cells[start + x0:start + x1]))
+
+    def setSpan(self, y: int, x0: int, values: list) -> None:
+        """Write a list of values into row y starting at column x0 as one slice of indices"""
+
+        codes = [self._code(value) for value in values]
+        start = y * self.cols + x0
+        self._cells[start:start + len(codes)] = array(self._cells.typecode, codes)
+
+    def fillSpan(self, y: int, x0: int, x1: int, data) -> None:
+        """Write data to row y from column x0 up to x1 as one slice of indices"""
+
+        code = self._code(data)
+        start = y * self.cols
+        self._cells[start + x0:start + x1] = array(self._cells.typecode, [code]) * (x1 - x0)
+
+    def find(self, data) -> list[Tuple[int,int]]:
+        """Return coordinates of all cells holding any of the given values by scanning for their palette indices"""
+
+        codes = set().union(*(self._matches(value) for value in data))
+        found = _ListStorage._scan(self._cells, codes)
+        if len(codes) > 1: found.sort()
+        cols = self.cols
+        return [(i % cols, i // cols) for i in found]
+
+    def aggregate(self, operation: str, cols: list[int] | None = None, rows: list[int] | None = None):
+        """Reduce the selected cells. Whole-grid counts tally palette indices and decode once per distinct value"""
+
+        if operation != 'counts' or cols is not None or rows is not None: return super().aggregate(operation, cols, rows)
+        counts = {}
+        for code, number in Counter(self._cells).items():
+            value = self._palette[code]
+            counts[value] = counts.get(value, 0) + number
+        return counts
+
+    def count(self, data) -> int:
+        """Return number of cells holding data by counting its palette index"""
+
+        return sum(self._cells.count(code) for code in self._matches(data))
+
+    def first(self, data) -> Tuple[int,int] | None:
+        """Return the first coordinates in row-major order holding data, None if there are none"""
+
+        i = min((self._cells.index(code) for code in self._matches(data) if code in self._cells), default=None)
+        return None if i is None else (i % self.cols, i // self.cols)
+
+    @property
+    def palette(self) -> list:
+        """Distinct values stored so far, in order of first use"""
+
+        return list(self._palette)
+
+_BYTE_BITS = [tuple(bool(byte >> k & 1) for k in range(8)) for byte in range(256)]
+
+class _BitStorage(_Storage):
+    """Bit-packed boolean storage, one bit per cell in a bytearray padded to whole 64-bit words.
+    Cell i lives in bit i & 7 of byte i >> 3, so the buffer read as a little-endian int has cell i at bit i"""
+
+    name = 'bits'
+
+    def __init__(self, cols: int, rows: int, defaultData=False) -> None:
+        """Build all cells set or clear depending on defaultData"""
+
+        super().__init__(cols, rows, bool(defaultData))
+        self._bits = bytearray(-(-cols * rows // 64) * 8)
+        if defaultData: self.fill(True)
+
+    @classmethod
+    def fromInt(cls, cols: int, rows: int, value: int) -> _BitStorage:
+        """Build storage whose cell i is bit i of value"""
+
+        storage = cls(cols, rows)
+        storage._bits[:] = value.to_bytes(len(storage._bits), 'little')
+        return storage
+
+    def toInt(self) -> int:
+        """Return all cells as one int, cell i at bit i"""
+
+        return int.from_bytes(self._bits, 'little')
+
+    def __getitem__(self, xyPair: Tuple[int,int]) -> bool:
+        i = self._index(xyPair)
+        return bool(self._bits[i >> 3] >> (i & 7) & 1)
+
+    def __setitem__(self, xyPair: Tuple[int,int], data) -> None:
+        i = self._index(xyPair)
+        if data:
+            self._bits[i >> 3] |= 1 << (i & 7)
+        else:
+            self._bits[i >> 3] &= ~(1 << (i & 7))
+
+    def values(self):
+        """Yields every cell value in row-major order"""
+
+        return islice(chain.from_iterable(map(_BYTE_BITS.__getitem__, self._bits)), self.cols * self.rows)
+
+    def items(self):
+        """Yields (coordinates, value) pairs in row-major order"""
+
+        cells = self.values()
+        for j in range(self.rows):
+            for i in range(self.cols):
+                yield (i,j), next(cells)
+
+    def toList(self) -> list:
+        """Return a new flat row-major list of all cell values"""
+
+        return list(self.values())
+
+    def loadList(self, values: list) -> None:
+        """Overwrite every cell from a flat row-major list of values"""
+
+        bits = ''.join('1' if value else '0' for value in reversed(values))
+        self._bits[:] = int(bits or '0', 2).to_bytes(len(self._bits), 'little')
+
+    def rawBuffer(self) -> memoryview:
+        """Return a zero-copy view of the packed bytes"""
+
+        return memoryview(self._bits)
+
+    def fill(self, data) -> None:
+        """Set or clear every cell, leaving the padding bits clear"""
+
+        self._bits[:] = (((1 << self.cols * self.rows) - 1) if data else 0).to_bytes(len(self._bits), 'little')
+
+    def popcount(self) -> int:
+        """Number of set cells"""
+
+        return self.toInt().bit_count()
+
+    def aggregate(self, operation: str, cols: list[int] | None = None, rows: list[int] | None = None):
+        """Reduce the selected cells. Whole-grid counts and sums come from the popcount"""
+
+        if operation not in ('counts', 'sum') or cols is not None or rows is not None: return super().aggregate(operation, cols, rows)
+        setCells = self.popcount()
+        if operation == 'sum': return setCells
+        counts = {False: self.cols * self.rows - setCells, True: setCells}
+        return {value: number for value, number in counts.items() if number}
+
+    def count(self, data) -> int:
+        """Return number of cells holding data from the popcount"""
+
+        if data is True or data == True: return self.popcount()
+        if data is False or data == False: return self.cols * self.rows - self.popcount()
+        return 0
+
+    def find(self, data) -> list[Tuple[int,int]]:
+        """Return coordinates of all cells holding any of the given values by scanning 64-bit words, skipping words with no match"""
+
+        wantSet = True in data
+        wantClear = False in data
+        if not (wantSet or wantClear): return []
+
+        size = self.cols * self.rows
+        cols = self.cols
+        found = []
+        for w, word in enumerate(memoryview(self._bits).cast('Q')):
+            if sys.byteorder != 'little': word = int.from_bytes(word.to_bytes(8, sys.byteorder), 'little')
+            if not wantSet: word ^= 0xFFFFFFFFFFFFFFFF
+            elif wantClear: word = 0xFFFFFFFFFFFFFFFF
+            base = w << 6
+            while word:
+                low = word & -word
+                i = base + low.bit_length() - 1
+                if i >= size: break
+                found.append((i % cols, i // cols))
+                word ^= low
+        return found
+
+class _ViewStorage(_Storage):
+    """Window onto a rectangle of another Array2D's storage. Nothing is copied, reads and writes go straight to the parent"""
+
+    name = 'view'
+
+    def __init__(self, parent: Array2D, x0: int, y0: int, cols: int, rows: int) -> None:
+        """Reference cols x rows cells of parent starting at (x0, y0)"""
+
+        super().__init__(cols, rows, parent._matrix.defaultData)
+        self.parent = parent
+        self.x0 = x0
+        self.y0 = y0
+
+    def __getitem__(self, xyPair: Tuple[int,int]):
+        self._index(xyPair)
+        return self.parent._matrix[(xyPair[0] + self.x0, xyPair[1] + self.y0)]
+
+    def __setitem__(self, xyPair: Tuple[int,int], data) -> None:
+        self._index(xyPair)
+        self.parent._matrix[(xyPair[0] + self.x0, xyPair[1] + self.y0)] = data
+
+    def values(self):
+        """Yields every cell value in row-major order, reading the parent one row span at a time"""
+
+        for j in range(self.rows):
+            yield from self.getSpan(j, 0, self.cols)
+
+    def items(self):
+        """Yields (coordinates, value) pairs in row-major order"""
+
+        for j in range(self.rows):
+            for i, value in enumerate(self.getSpan(j, 0, self.cols)):
+                yield (i,j), value
+
+    def getSpan(self, y: int, x0: int, x1: int) -> list:
+        """Return values of row y from column x0 up to x1 from the parent"""
+
+        return self.parent._matrix.getSpan(y + self.y0, x0 + self.x0, x1 + self.x0)
+
+    def setSpan(self, y: int, x0: int, values: list) -> None:
+        """Write a list of values into row y starting at column x0 of the parent"""
+
+        self.parent._matrix.setSpan(y + self.y0, x0 + self.x0, values)
+
+    def fillSpan(self, y: int, x0: int, x1: int, data) -> None:
+        """Write data to row y from column x0 up to x1 of the parent"""
+
+        self.parent._matrix.fillSpan(y + self.y0, x0 + self.x0, x1 + self.x0, data)
+
+    def fill(self, data) -> None:
+        """Write data to every cell of the window"""
+
+        for j in range(self.rows):
+            self.fillSpan(j, 0, self.cols, data)
+
+    def like(self) -> Tuple[str, dict]:
+        """Return storage name and constructor options for building an in-memory storage like the parent's"""
+
+        return self.parent._matrix.like()
+
+    def flush(self) -> None:
+        """Persist pending writes of the parent"""
+
+        self.parent.flush()
+
+class _ValueIndex:
+    """Inverted index from each (hashable) cell value to the coordinates holding it, kept up to date by _WatchedStorage"""
+
+    def __init__(self, storage: _Storage) -> None:
+        """Index every cell of storage"""
+
+        self.reset(storage)
+
+    def reset(self, storage: _Storage) -> None:
+        """Rebuild the index from scratch after a bulk write"""
+
+        self._cells = {}
+        self._first = {}
+        for coord, value in storage.items():
+            bucket = self._cells.setdefault(value, {})
+            if not bucket: self._first[value] = coord
+            bucket[coord] = None
+
+    def update(self, coord: Tuple[int,int], old, new) -> None:
+        """Move coordinates from old value's entry to new value's entry, keeping each value's row-major first cell"""
+
+        bucket = self._cells.setdefault(new, {})
+        oldBucket = self._cells[old]
+        del oldBucket[coord]
+        if self._first.get(old) == coord: del self._first[old]
+        if not oldBucket and oldBucket is not bucket: del self._cells[old]
+        bucket[coord] = None
+        first = self._first.get(new)
+        if first is not None and (coord[1], coord[0]) < (first[1], first[0]): self._first[new] = coord
+
+    def find(self, data) -> list[Tuple[int,int]]:
+        """Return coordinates of all cells holding any of the given values in row-major order"""
+
+        found = set()
+        for value in data:
+            found.update(self._cells.get(value, ()))
+        return sorted(found, key=lambda coord: (coord[1], coord[0]))
+
+    def count(self, data) -> int:
+        """Return number of cells holding data"""
+
+        return len(self._cells.get(data, ()))
+
+    def first(self, data) -> Tuple[int,int] | None:
+        """Return the first coordinates in row-major order holding data, None if there are none. The first cell is
+        cached per value and only searched for again after it is overwritten"""
+
+        first = self._first.get(data)
+        if first is None and self._cells.get(data):
+            first = self._first[data] = min(self._cells[data], key=lambda coord: (coord[1], coord[0]))
+        return first
+
+class PrefixSums:
+    """Summed-area table of a numeric matrix answering rectangle sums in O(1). Live tables are a 2D Fenwick tree kept up
+    to date by _WatchedStorage, so writes cost O(log cols * log rows) and sums O(log cols * log rows) as well"""
+
+    def __init__(self, storage: _Storage, wrapX=False, wrapY=False, live=False) -> None:
+        """Build the table from every cell of storage"""
+
+        self._cols = storage.cols
+        self._rows = storage.rows
+        self._wrapX = wrapX
+        self._wrapY = wrapY
+        self._live = live
+        self.reset(storage)
+
+    def __repr__(self) -> str:
+        """Basic data for debugging"""
+
+        return f'PrefixSums({self._rows}x{self._cols}{", live" if self._live else ""})'
+
+    @staticmethod
+    def _summedArea(rows: list[list]) -> list[list]:
+        """Return the summed-area table of a list of equal-length rows: entry [y][x] is the sum of rows[:y] columns [:x]"""
+
+        table = [[0] * (len(rows[0]) + 1)]
+        for values in rows:
+            total = 0
+            row = [0]
+            for above, value in zip(table[-1][1:], values):
+                total += value
+                row.append(above + total)
+            table.append(row)
+        return table
+
+    def reset(self, storage: _Storage) -> None:
+        """Rebuild the table from scratch after a bulk write, in O(cols * rows)"""
+
+        cols = self._cols
+        values = storage.toList()
+        if self._live:
+            tree = [[0] * (cols + 1)]
+            for y in range(self._rows):
+                row = [0] + values[y * cols:(y + 1) * cols]
+                for i in range(1, cols + 1):
+                    parent = i + (i & -i)
+                    if parent <= cols: row[parent] += row[i]
+                tree.append(row)
+            for j in range(1, self._rows + 1):
+                parent = j + (j & -j)
+                if parent <= self._rows: tree[parent] = [a + b for a, b in zip(tree[parent], tree[j])]
+            self._table = tree
+        else:
+            self._table = self._summedArea([values[y * cols:(y + 1) * cols] for y in range(self._rows)])
+
+    def update(self, coord: Tuple[int,int], old, new) -> None:
+        """Add the change of one cell to a live table"""
+
+        delta = new - old
+        if not delta: return
+        table = self._table
+        j = coord[1] + 1
+        while j <= self._rows:
+            row = table[j]
+            i = coord[0] + 1
+            while i <= self._cols:
+                row[i] += delta
+                i += i & -i
+            j += j & -j
+
+    def _prefix(self, x: int, y: int):
+        """Sum of the cells above and left of (x, y), i.e. of columns 0 up to x of rows 0 up to y"""
+
+        if not self._live: return self._table[y][x]
+        total = 0
+        table = self._table
+        while y:
+            row = table[y]
+            i = x
+            while i:
+                total += row[i]
+                i -= i & -i
+            y -= y & -y
+        return total
+
+    def rectSum(self, x: int, y: int, w: int, h: int):
+        """Return the sum of the w x h rectangle with top-left corner (x, y). The rectangle wraps around edges for
+        wrapX/wrapY and is otherwise clipped to the matrix"""
+
+        if w < 1 or h < 1:
+            warn("ERROR: Rectangle width and height must be at least 1. Returning None.")
+            return None
+
+        xSpans, xClipped = Array2D._axisSpans(x, w, self._cols, self._wrapX)
+        ySpans, yClipped = Array2D._axisSpans(y, h, self._rows, self._wrapY)
+        prefix = self._prefix
+        total = 0
+        for y0, _, rows in ySpans:
+            for x0, _, cols in xSpans:
+                total += prefix(x0 + cols, y0 + rows) - prefix(x0, y0 + rows) - prefix(x0 + cols, y0) + prefix(x0, y0)
+
+        if xClipped or yClipped: warn("ERROR: Rectangle was partly out of range of the matrix. Summing only coordinates within matrix bounds.")
+        return total
+
+    @property
+    def live(self) -> bool:
+        """Returns whether the table follows writes to its matrix"""
+
+        return self._live
+
+class _WatchedStorage(_Storage):
+    """Wrapper around another storage that reports every write to its watchers as (coordinates, old value, new value),
+    or asks them to reset after bulk writes. Holds the optional value index that answers find/count/first"""
+
+    def __init__(self, inner: _Storage) -> None:
+        """Wrap inner storage with no watchers yet"""
+
+        super().__init__(inner.cols, inner.rows, inner.defaultData)
+        self.inner = inner
+        self.watchers = []
+        self.index = None
+
+    def __getattr__(self, attribute: str):
+        if attribute == 'inner' or attribute.startswith('__'): raise AttributeError(attribute)
+        return getattr(self.inner, attribute)
+
+    @property
+    def name(self) -> str:
+        """Name of the wrapped storage"""
+
+        return self.inner.name
+
+    def _reset(self, previous: list) -> None:
+        """Tell every watcher to rebuild after a bulk write. If one fails the previous flat list of values is
+        restored and every watcher rebuilt from it before the error is raised"""
+
+        try:
+            for watcher in self.watchers:
+                watcher.reset(self.inner)
+        except Exception:
+            self.inner.loadList(previous)
+            for watcher in self.watchers:
+                watcher.reset(self.inner)
+            raise
+
+    def _notify(self, coord: Tuple[int,int], old, new) -> None:
+        """Report a single cell write to every watcher. If one fails the watchers already told are reverted,
+        newest first, before the error is raised"""
+
+        told = []
+        try:
+            for watcher in self.watchers:
+                watcher.update(coord, old, new)
+                told.append(watcher)
+        except Exception:
+            for watcher in reversed(told):
+                watcher.update(coord, new, old)
+            raise
+
+    def __getitem__(self, xyPair: Tuple[int,int]):
+        return self.inner[xyPair]
+
+    def __setitem__(self, xyPair: Tuple[int,int], data) -> None:
+        old = self.inner[xyPair]
+        self.inner[xyPair] = data
+        try:
+            self._notify(xyPair, old, self.inner[xyPair])
+        except Exception:
+            self.inner[xyPair] = old
+            raise
+
+    def __contains__(self, xyPair) -> bool:
+        return xyPair in self.inner
+
+    def keys(self):
+        """Yields every coordinate in row-major order"""
+
+        return self.inner.keys()
+
+    def values(self):
+        """Yields every cell value in row-major order"""
+
+        return self.inner.values()
+
+    def items(self):
+        """Yields (coordinates, value) pairs in row-major order"""
+
+        return self.inner.items()
+
+    def toList(self) -> list:
+        """Return a new flat row-major list of all cell values"""
+
+        return self.inner.toList()
+
+    def getSpan(self, y: int, x0: int, x1: int) -> list:
+        """Return values of row y from column x0 up to x1"""
+
+        return self.inner.getSpan(y, x0, x1)
+
+    def rawBuffer(self) -> memoryview | None:
+        """Return the wrapped storage's raw buffer. Writes made through it bypass the watchers"""
+
+        return self.inner.rawBuffer()
+
+    def loadList(self, values: list) -> None:
+        """Overwrite every cell from a flat row-major list of values, then reset the watchers"""
+
+        previous = self.inner.toList()
+        self.inner.loadList(values)
+        self._reset(previous)
+
+    def fill(self, data) -> None:
+        """Write data to every cell, then reset the watchers"""
+
+        previous = self.inner.toList()
+        self.inner.fill(data)
+        self._reset(previous)
+
+    def setSpan(self, y: int, x0: int, values: list) -> None:
+        """Write a list of values into row y starting at column x0, one watched cell at a time"""
+
+        for i, value in enumerate(values, x0):
+            self[(i,y)] = value
+
+    def fillSpan(self, y: int, x0: int, x1: int, data) -> None:
+        """Write data to row y from column x0 up to x1, one watched cell at a time"""
+
+        for i in range(x0, x1):
+            self[(i,y)] = data
+
+    def where(self, predicate, x0: int, y0: int, x1: int, y1: int):
+        """Yields coordinates whose value satisfies predicate from the wrapped storage"""
+
+        return self.inner.where(predicate, x0, y0, x1, y1)
+
+    def select(self, cols: list[int] | None, rows: list[int] | None):
+        """Yields values of the given cols of the given rows"""
+
+        return self.inner.select(cols, rows)
+
+    def aggregate(self, operation: str, cols: list[int] | None = None, rows: list[int] | None = None):
+        """Reduce the selected cells of the wrapped storage"""
+
+        return self.inner.aggregate(operation, cols, rows)
+
+    def find(self, data) -> list[Tuple[int,int]]:
+        """Return coordinates of all cells holding any of the given values, from the value index if there is one"""
+
+        return self.index.find(data) if self.index else self.inner.find(data)
+
+    def count(self, data) -> int:
+        """Return number of cells holding data, from the value index if there is one"""
+
+        return self.index.count(data) if self.index else self.inner.count(data)
+
+    def first(self, data) -> Tuple[int,int] | None:
+        """Return the first coordinates in row-major order holding data, from the value index if there is one"""
+
+        return self.index.first(data) if self.index else self.inner.first(data)
+
+    def like(self) -> Tuple[str, dict]:
+        """Return storage name and constructor options of the wrapped storage"""
+
+        return self.inner.like()
+
+    def flush(self) -> None:
+        """Persist pending writes of the wrapped storage"""
+
+        self.inner.flush()
+
+class _ParentMap(Mapping):
+    """Read-only map from each reached (x, y) to the (x, y) it was reached from (None for start cells), decoded on demand
+    from a search's flat parent indices so building it costs nothing per cell"""
+
+    def __init__(self, parent: list[int], reached: list[int], cols: int) -> None:
+        """Keep the flat parent list (-1 for start cells) and the reached flat indices"""
+
+        self._parent = parent
+        self._reached = reached
+        self._cols = cols
+        self._reachedSet = None
+
+    def __getitem__(self, xyPair: Tuple[int,int]) -> Tuple[int,int] | None:
+        if xyPair not in self: raise KeyError(xyPair)
+        parent = self._parent[xyPair[1] * self._cols + xyPair[0]]
+        return None if parent < 0 else (parent % self._cols, parent // self._cols)
+
+    def __contains__(self, xyPair) -> bool:
+        if self._reachedSet is None: self._reachedSet = set(self._reached)
+        try:
+            x, y = xyPair
+            return 0 <= x < self._cols and y * self._cols + x in self._reachedSet
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self):
+        """Yields reached coordinates in the order they were reached"""
+
+        cols = self._cols
+        return ((i % cols, i // cols) for i in self._reached)
+
+    def __len__(self) -> int:
+        return len(self._reached)
+
+_STORAGES = {
+    'dict': _DictStorage,
+    'dense': _ListStorage,
+    'typed': _TypedStorage,
+    'numpy': _NumpyStorage,
+    'sparse': _SparseStorage,
+    'tiled': _TiledStorage,
+    'palette': _PaletteStorage,
+    'bits': _BitStorage,
+}
+
+_TYPED_STORAGES = {'typed', 'numpy'}
+
+class Array2D:
+    
+    
+    def __init__(self, cols: int, rows: int, defaultData=None, wrapX=False, wrapY=False, storage: str | None = None, dtype: str | None = None, tileSize: int | None = None, indexed=False) -> None:
+        """Initialize 2D array with immutable coordinates, no gaps or overlap allowed. storage picks the backend holding the cells:
+        - 'dict': tuple-keyed dict (default)
+        - 'dense': one row-major list
+        - 'typed': array.array of the dtype typecode (default when only dtype is given)
+        - 'numpy': ndarray of shape (rows, cols), falls back to 'typed' or 'dense' when NumPy is not installed
+        - 'sparse': only cells differing from defaultData are stored
+        - 'tiled': tileSize x tileSize tiles (default 64) allocated on first write
+        - 'palette': table of distinct values plus a one to four byte table index per cell
+        - 'bits': booleans packed one bit per cell, see BitArray2D for whole-grid bitwise operations
+        indexed = True keeps a value index (see buildIndex) so findAny, count and first need not scan"""
+
+        if cols < 1 or rows < 1: raise Exception("Cannot initiate an Array2D with less than 1 row and/or column")
+        if storage is None: storage = 'typed' if dtype else 'dict'
+        if storage == 'numpy' and np is None:
+            storage = 'typed' if dtype in tuple(typecodes) else 'dense'
+            if storage == 'dense': dtype = None
+            warn(f"ERROR: NumPy is not installed. Using '{storage}' storage instead.")
+        if storage not in _STORAGES: raise Exception(f"Unknown storage '{storage}', expected one of {', '.join(_STORAGES)}")
+        if dtype and storage not in _TYPED_STORAGES: raise Exception(f"Storage '{storage}' does not take a dtype")
+        if dtype and storage == 'typed' and dtype not in tuple(typecodes): raise Exception(f"Invalid dtype '{dtype}', expected one of the typecodes {typecodes}")
+        if dtype and storage == 'numpy':
+            try:
+                np.dtype(dtype)
+            except TypeError:
+                raise Exception(f"Invalid dtype '{dtype}' for NumPy storage")
+        if tileSize is not None and storage != 'tiled': raise Exception(f"Storage '{storage}' does not take a tileSize")
+        if tileSize is not None and tileSize < 1: raise Exception("Cannot use a tileSize less than 1")
+
+        options = {}
+        if dtype: options['dtype'] = dtype
+        if tileSize is not None: options['tileSize'] = tileSize
+
+        try:
+            self._rows = rows
+            self._cols = cols
+            self._wrapX = wrapX
+            self._wrapY = wrapY
+            self._matrix = _STORAGES[storage](cols, rows, defaultData, **options)
+            if indexed: self.buildIndex()
+        except Exception as e:
+            print(f'ERROR: {e}')
+
+    @classmethod
+    def _fromStorage(cls, matrix: _Storage, wrapX=False, wrapY=False) -> Array2D:
+        """Wrap already built storage in a new Array2D without allocating any cells"""
+
+        grid = cls.__new__(cls)
+        grid._rows = matrix.rows
+        grid._cols = matrix.cols
+        grid._wrapX = wrapX
+        grid._wrapY = wrapY
+        grid._matrix = matrix
+        return grid
+
+    @classmethod
+    def openMmap(cls, path: str, cols: int, rows: int, dtype: str = 'i', wrapX=False, wrapY=False, writable=True) -> Array2D:
+        """Open a raw row-major binary file of cols * rows dtype items (e.g. one written from grid.buffer) as the
+        storage of a new Array2D. Opening is instant, pages load on demand and setData writes through to the file"""
+
+        if cols < 1 or rows < 1: raise Exception("Cannot initiate an Array2D with less than 1 row and/or column")
+
+        return cls._fromStorage(_MmapStorage(cols, rows, path, dtype, writable), wrapX, wrapY)
+
+    
+    def __repr__(self) -> str:
+        """Basic data for debugging"""
+
+        return f'Array2D({self._rows}x{self._cols})'
+
+    def __getitem__(self, key: Tuple[int | slice, int | slice]) -> Array2D | None:
+        """Return a view of grid[rows, cols], e.g. grid[y0:y1, x0:x1], whose reads and writes reach this matrix.
+        An int selects a single row or column, .copy() materializes the view. Returns None if the selection is empty"""
+
+        if not (isinstance(key, tuple) and len(key) == 2 and all(isinstance(k, (int, slice)) for k in key)):
+            raise Exception("Invalid index, expected grid[rows, cols] with ints or slices")
+
+        spans = []
+        for k, size in zip(key, (self._rows, self._cols)):
+            if isinstance(k, int):
+                k = slice(k, k + 1 if k != -1 else None)
+            start, stop, step = k.indices(size)
+            if step != 1: raise Exception("Array2D views do not support slice steps")
+            spans.append((start, stop - start))
+        (y0, rows), (x0, cols) = spans
+        if rows < 1 or cols < 1:
+            warn("ERROR: Selected rows/columns are empty or out of range of the matrix. Returning None.")
+            return None
+
+        parent = self
+        if isinstance(self._matrix, _ViewStorage):
+            parent = self._matrix.parent
+            x0 += self._matrix.x0
+            y0 += self._matrix.y0
+        return type(parent)._fromStorage(_ViewStorage(parent, x0, y0, cols, rows))
+
+    def copy(self) -> Array2D:
+        """Return a new Array2D holding a copy of this matrix's data in the same kind of in-memory storage.
+        Views are materialized into their parent's kind of storage"""
+
+        name, options = self._matrix.like()
+        matrix = _STORAGES[name](self._cols, self._rows, self._matrix.defaultData, **options)
+        matrix.loadList(self._matrix.toList())
+        return type(self)._fromStorage(matrix, self._wrapX, self._wrapY)
+    
+    
+    def __iter__(self):
+        """Yields all dictionary entries of this Array2D as Points, iterates over rows (left to right, then down at end of row)"""
+
+        for coord, data in self._matrix.items():
+            yield Point(coord,data)
+
+    def items(self):
+        """Yields ((x, y), data) for every cell in row-major order without creating Points"""
+
+        return iter(self._matrix.items())
+
+    def values(self):
+        """Yields data of every cell in row-major order"""
+
+        return iter(self._matrix.values())
+
+    def cursor(self):
+        """Yields a single reused Point rebound to each cell in row-major order. It is overwritten on every step,
+        so copy out its position or data (or build a new Point) before advancing if they need to be kept"""
+
+        point = Point((0,0))
+        for coord, data in self._matrix.items():
+            point._xyPair = coord
+            point._data = data
+            yield point
+    
+    
+    def iterLocs(self, cols: None | int | list[int] = None, rows: None | int | list[int] = None, transpose: bool = False):
+        """Yields the x, y tuple in row-iterating order for the given cols and rows, iterates over entire Array2D if cols/rows unspecified.
+        No values iterates all points in Array2D. transpose = True iterates over columns instead of rows"""
+
+        giveWarning = True
+
+        if isinstance(cols, int): cols = [cols]
+        if isinstance(rows, int): rows = [rows]
+
+        if cols == None: cols = [i for i in range(self._cols)]
+        if rows == None: rows = [i for i in range(self._rows)]
+
+        if not (isinstance(cols, list) and isinstance(rows, list)):
+            raise Exception("Invalid argument type, expected int or list of ints for cols and rows. No iterator function returned.")
+        try:
+            if not transpose:
+                for j in rows:
+                    for i in cols:
+                        if i < self._cols and j < self._rows:
+                            yield (i,j)
+                        else:
+                            if giveWarning: warn("ERROR: At least one listed row/column was out of range of the source matrix. Returning only coordinates within matrix bounds.")
+                            giveWarning = False
+            else:
+                for i in cols:
+                    for j in rows:
+                        if i < self._cols and j < self._rows:
+                            yield (i,j)
+                        else:
+                            if giveWarning: warn("ERROR: At least one listed row/column was out of range of the source matrix. Returning only coordinates within matrix bounds.")
+                            giveWarning = False
+        except Exception as e:
+            print(f'ERROR: {e}')
+
+    def getData(self, xyPair: Tuple[int,int] | list[Tuple[int,int]]):
+        """Pull data from point at given coordinates. Returns list of data if list of tuple(x,y) provided. Returns None for coordinates out of range of array"""
+
+        if isinstance(xyPair, tuple):
+            try:
+                return self._matrix[xyPair]
+            except KeyError:
+                warn("ERROR: Given coordinates are out of range. Returning None.")
+                return None
+        elif (isinstance(xyPair, list) and all(isinstance(p, tuple) and len(p) == 2 for p in xyPair)):
+            dataList = []
+            giveWarning = True
+            for pair in xyPair:
+                try:
+                    dataList.append(self._matrix[pair])
+                except KeyError:
+                    dataList.append(None)
+                    if giveWarning: warn("ERROR: At least one coordinate was out of range of matrix. Returning None for data of invalid coordinates.")
+                    giveWarning = False
+            return dataList
+        else:
+            warn("ERROR: Passed an invalid argument type, expected Tuple[int,int] or list of Tuple[int,int]. Returning None.")
+            return None
+
+    def setData(self, xyPair: Tuple[int,int] | list[Tuple[int,int]], data) -> None:
+        """Update data for given coordinates"""
+        
+        giveWarning = False
+        if isinstance(xyPair,tuple): xyPair = [xyPair]
+
+        if not (isinstance(xyPair, list) and all(isinstance(p, tuple) and len(p) == 2 for p in xyPair)):
+            raise Exception("ERROR: Passed an invalid argument type, expected Tuple[int,int] or list of Tuple[int,int]. No data updates completed")
+
+        try:
+            giveWarning = not self._matrix.setMany(xyPair, data)
+        except Exception as e:
+            print(f'ERROR: {e}')
+        
+        if giveWarning: warn("ERROR: Some listed rows/columns were out of range of the target matrix. Updating data only for coordinates within matrix bounds.")
+
+    def loadFrom(self, point: Point) -> None:
+        """Assign data from a given point directly to same coordinates on the matrix"""
+
+        try:
+            self._matrix[point.getPos()] = point.getData()
+        except KeyError:
+            warn("ERROR: Given point is out of range of this matrix. Matrix data was not updated.")
+
+    def saveTo(self, point: Point) -> None:
+        """Assign data from a matrix point to another Point object with the same coordinates"""
+        try:
+            point.setData(self._matrix[point.getPos()])
+        except KeyError:
+            warn("ERROR: Given point is out of range of this matrix. Point data was not updated.")
+
+    def findAny(self, *data) -> list[Tuple[int,int]]:
+        """Return all coordinates containing specific piece(s) of data"""
+
+        return self._matrix.find(data)
+
+    def findWhere(self, predicate, region: Tuple[int,int,int,int] | None = None, limit: int | None = None):
+        """Lazily yields coordinates in row-major order whose data satisfies predicate (a callable or a comparison such
+        as ('>', 5)), within region (x, y, w, h) if given and stopping after limit matches"""
+
+        if isinstance(predicate, tuple):
+            if len(predicate) != 2 or predicate[0] not in _COMPARISONS:
+                raise Exception(f"Invalid comparison, expected (operator, value) with operator one of {', '.join(_COMPARISONS)}")
+        elif not callable(predicate):
+            raise Exception("Invalid predicate, expected a callable or an (operator, value) comparison tuple")
+
+        x0, y0, x1, y1 = 0, 0, self._cols, self._rows
+        if region is not None:
+            x, y, w, h = region
+            x0, y0, x1, y1 = max(x, 0), max(y, 0), min(x + w, self._cols), min(y + h, self._rows)
+            if (x0, y0, x1, y1) != (x, y, x + w, y + h): warn("ERROR: Region was partly out of range of the matrix. Searching only coordinates within matrix bounds.")
+            if x1 <= x0 or y1 <= y0: return iter(())
+
+        matches = self._matrix.where(predicate, x0, y0, x1, y1)
+        return matches if limit is None else islice(matches, limit)
+
+    def _wrapAxes(self, wrap: bool | None) -> Tuple[bool, bool]:
+        """Resolve a wrap argument: None follows wrapX/wrapY, a bool applies to both axes"""
+
+        return (self._wrapX, self._wrapY) if wrap is None else (wrap, wrap)
+
+    def _neighborsOf(self, x: int, y: int, offsets, wrapX: bool, wrapY: bool) -> list[Tuple[int,int]]:
+        """Neighbors of in-range (x, y) for an offset table, wrapping or skipping cells past the edges"""
+
+        cols = self._cols
+        rows = self._rows
+        found = []
+        for dx, dy in offsets:
+            i = x + dx
+            j = y + dy
+            if not 0 <= i < cols:
+                if not wrapX: continue
+                i %= cols
+            if not 0 <= j < rows:
+                if not wrapY: continue
+                j %= rows
+            found.append((i,j))
+        if (wrapX and cols < 3) or (wrapY and rows < 3):
+            found = [coord for coord in dict.fromkeys(found) if coord != (x,y)]
+        return found
+
+    def neighbors(self, xyPair: Tuple[int,int], connectivity: int = 4, wrap: bool | None = None) -> list[Tuple[int,int]]:
+        """Return coordinates of the 4 (up, right, down, left) or 8 (clockwise from up) neighbors of a cell.
+        Cells past an edge wrap around when wrap is set (None follows wrapX/wrapY) and are silently skipped otherwise"""
+
+        if connectivity not in _NEIGHBOR_OFFSETS: raise Exception("Invalid connectivity, expected 4 or 8")
+        if xyPair not in self._matrix:
+            warn("ERROR: Given coordinates are out of range. Returning no neighbors.")
+            return []
+
+        return self._neighborsOf(xyPair[0], xyPair[1], _NEIGHBOR_OFFSETS[connectivity], *self._wrapAxes(wrap))
+
+    def neighborValues(self, xyPair: Tuple[int,int], connectivity: int = 4, wrap: bool | None = None) -> list:
+        """Return data of the cells given by neighbors() in the same order"""
+
+        matrix = self._matrix
+        return [matrix[coord] for coord in self.neighbors(xyPair, connectivity, wrap)]
+
+    def neighborsMany(self, xyPairs: list[Tuple[int,int]], connectivity: int = 4, wrap: bool | None = None) -> list[list[Tuple[int,int]]]:
+        """Return neighbors() of each listed cell, one list per cell, sharing the offset table and wrap lookups.
+        Cells out of range get an empty list"""
+
+        if connectivity not in _NEIGHBOR_OFFSETS: raise Exception("Invalid connectivity, expected 4 or 8")
+
+        offsets = _NEIGHBOR_OFFSETS[connectivity]
+        wrapX, wrapY = self._wrapAxes(wrap)
+        matrix = self._matrix
+        giveWarning = False
+        found = []
+        for xyPair in xyPairs:
+            if xyPair in matrix:
+                found.append(self._neighborsOf(xyPair[0], xyPair[1], offsets, wrapX, wrapY))
+            else:
+                found.append([])
+                giveWarning = True
+        if giveWarning: warn("ERROR: At least one coordinate was out of range of matrix. Returning no neighbors for invalid coordinates.")
+        return found
+
+    def _flatNeighbors(self, connectivity: int, wrap: bool | None = None):
+        """Return a function giving the flat indices (y * cols + x) of a flat index's neighbors. Interior cells are
+        a fixed set of index deltas, edge cells go through the wrap-aware coordinate path"""
+
+        if connectivity not in _NEIGHBOR_OFFSETS: raise Exception("Invalid connectivity, expected 4 or 8")
+
+        offsets = _NEIGHBOR_OFFSETS[connectivity]
+        cols = self._cols
+        rows = self._rows
+        wrapX, wrapY = self._wrapAxes(wrap)
+        deltas = [dy * cols + dx for dx, dy in offsets]
+        neighborsOf = self._neighborsOf
+
+        def step(index: int) -> list[int]:
+            y, x = divmod(index, cols)
+            if 0 < x < cols - 1 and 0 < y < rows - 1: return [index + delta for delta in deltas]
+            return [j * cols + i for i, j in neighborsOf(x, y, offsets, wrapX, wrapY)]
+
+        return step
+
+    def _blockedMask(self, passable) -> bytearray:
+        """Return one byte per cell in row-major order, 1 where the cell's data fails passable (None lets every cell pass)"""
+
+        if passable is None: return bytearray(self._cols * self._rows)
+        return bytearray(0 if passable(value) else 1 for value in self._matrix.values())
+
+    def _startIndices(self, start: Tuple[int,int] | list[Tuple[int,int]]) -> list[int]:
+        """Flat indices of one start cell or a list of them, raising for cells out of range"""
+
+        starts = [start] if isinstance(start, tuple) else start
+        if not starts or not all(isinstance(p, tuple) and p in self._matrix for p in starts):
+            raise Exception("Start coordinates must be in range of the matrix")
+        return [y * self._cols + x for x, y in starts]
+
+    @staticmethod
+    def tracePath(parents: Mapping, goal: Tuple[int,int]) -> list[Tuple[int,int]] | None:
+        """Follow a parent map from a search such as bfs back from goal, returning the path from its start to goal.
+        Returns None if goal was not reached"""
+
+        if goal not in parents: return None
+        path = [goal]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+
+    def bfs(self, start: Tuple[int,int] | list[Tuple[int,int]], passable=None, connectivity: int = 4) -> Tuple[Array2D, Mapping]:
+        """Breadth-first search from start, one (x, y) or a list of them, through cells whose data passes passable (every
+        cell if None). Returns an Array2D of step counts (None where unreachable) and a parent mapping, see tracePath"""
+
+        step = self._flatNeighbors(connectivity)
+        closed = self._blockedMask(passable)
+        distance = [None] * (self._cols * self._rows)
+        parent = [-1] * (self._cols * self._rows)
+        reached = []
+        queue = deque()
+        for index in self._startIndices(start):
+            if distance[index] is None:
+                closed[index] = 1
+                distance[index] = 0
+                queue.append(index)
+
+        while queue:
+            index = queue.popleft()
+            reached.append(index)
+            nextDistance = distance[index] + 1
+            for neighbor in step(index):
+                if not closed[neighbor]:
+                    closed[neighbor] = 1
+                    distance[neighbor] = nextDistance
+                    parent[neighbor] = index
+                    queue.append(neighbor)
+
+        distances = Array2D(self._cols, self._rows, None, self._wrapX, self._wrapY, storage='dense')
+        distances._matrix.loadList(distance)
+        return distances, _ParentMap(parent, reached, self._cols)
+
+    def _stepCosts(self, cost) -> list:
+        """Return the cost of entering each cell in row-major order, None for impassable cells. cost is a callable taking
+        the cell's data, or None to use the data itself as the cost"""
+
+        values = self._matrix.toList()
+        return values if cost is None else [cost(value) for value in values]
+
+    def _heuristic(self, heuristic, goal: Tuple[int,int], connectivity: int, scale: float):
+        """Return a function estimating the cost from a flat index to goal, measuring dx/dy the short way around wrapped axes"""
+
+        if heuristic is None: heuristic = 'manhattan' if connectivity == 4 else 'octile'
+        cols = self._cols
+        rows = self._rows
+        goalX, goalY = goal
+        if callable(heuristic): return lambda index: heuristic((index % cols, index // cols), goal)
+        if heuristic not in ('manhattan', 'octile'): raise Exception("Invalid heuristic, expected 'manhattan', 'octile' or a callable")
+
+        wrapX = self._wrapX
+        wrapY = self._wrapY
+        diagonal = math.sqrt(2) - 1
+        octile = heuristic == 'octile'
+
+        def estimate(index: int) -> float:
+            y, x = divmod(index, cols)
+            dx = abs(x - goalX)
+            dy = abs(y - goalY)
+            if wrapX and cols - dx < dx: dx = cols - dx
+            if wrapY and rows - dy < dy: dy = rows - dy
+            if octile: return (max(dx, dy) + diagonal * min(dx, dy)) * scale
+            return (dx + dy) * scale
+
+        return estimate
+
+    def _search(self, starts: list[int], goal: int | None, costs: list, connectivity: int, estimate=None):
+        """Best-first search over flat indices with a binary heap, popping the lowest cost-so-far plus estimate.
+        Diagonal steps cost sqrt(2) times the entered cell's cost. Returns (cost list, parent list, settled indices)"""
+
+        step = self._flatNeighbors(connectivity)
+        cols = self._cols
+        root2 = math.sqrt(2)
+        total = [None] * (cols * self._rows)
+        parent = [-1] * (cols * self._rows)
+        settled = bytearray(cols * self._rows)
+        reached = []
+        heap = []
+        for index in starts:
+            total[index] = 0
+            heappush(heap, (estimate(index) if estimate else 0, 0, index))
+
+        while heap:
+            _, _, index = heappop(heap)
+            if settled[index]: continue
+            settled[index] = 1
+            reached.append(index)
+            if index == goal: break
+
+            here = total[index]
+            x = index % cols
+            for neighbor in step(index):
+                stepCost = costs[neighbor]
+                if stepCost is None or settled[neighbor]: continue
+                if connectivity == 8 and neighbor % cols != x and neighbor // cols != index // cols: stepCost *= root2
+                candidate = here + stepCost
+                if total[neighbor] is None or candidate < total[neighbor]:
+                    total[neighbor] = candidate
+                    parent[neighbor] = index
+                    remaining = estimate(neighbor) if estimate else 0
+                    heappush(heap, (candidate + remaining, remaining, neighbor))
+        return total, parent, reached
+
+    def dijkstra(self, start: Tuple[int,int] | list[Tuple[int,int]], goal: Tuple[int,int] | None = None, cost=None, connectivity: int = 4) -> Tuple[Array2D, Mapping]:
+        """Cheapest paths from start, one (x, y) or a list of them, entering a cell costing cost(data) (the data itself
+        if cost is None, None is impassable). Returns an Array2D of path costs (None where unreached) and a parent mapping"""
+
+        starts = self._startIndices(start)
+        target = None if goal is None else self._startIndices(goal)[0]
+        total, parent, reached = self._search(starts, target, self._stepCosts(cost), connectivity)
+        if goal is not None:
+            settled = set(reached)
+            total = [value if i in settled else None for i, value in enumerate(total)]
+
+        distances = Array2D(self._cols, self._rows, None, self._wrapX, self._wrapY, storage='dense')
+        distances._matrix.loadList(total)
+        return distances, _ParentMap(parent, reached, self._cols)
+
+    def _jumpPointSearch(self, start: Tuple[int,int], goal: Tuple[int,int], blocked: bytearray, estimate, stats: dict | None):
+        """Jump point search between uniform-cost 8-connected cells of a passability bitmap, only jump points enter the
+        heap. Returns (path, cost) like astar"""
+
+        cols = self._cols
+        rows = self._rows
+        wrapX = self._wrapX
+        wrapY = self._wrapY
+        root2 = math.sqrt(2)
+
+        def free(x: int, y: int) -> bool:
+            if not 0 <= x < cols:
+                if not wrapX: return False
+                x %= cols
+            if not 0 <= y < rows:
+                if not wrapY: return False
+                y %= rows
+            return not blocked[y * cols + x]
+
+        rowLines = [bytes(blocked[j * cols:(j + 1) * cols]) for j in range(rows)]
+        colLines = [bytes(blocked[i::cols]) for i in range(cols)] if not wrapY else None
+
+        def scan(line: bytes, before: bytes | None, after: bytes | None, position: int, step: int, target: int) -> int | None:
+            """Straight jump along an unwrapped line with bytes.find: return steps to the nearest forced neighbor
+            (a blocked side cell followed by a free one) or target, None if a wall comes first"""
+
+            stops = []
+            if step > 0:
+                wall = line.find(1, position + 1)
+                if wall < 0: wall = len(line)
+                for side in (before, after):
+                    if side is not None:
+                        forced = side.find(b'\x01\x00', position + 1, wall + 1)
+                        if forced >= 0: stops.append(forced)
+                if position < target < wall: stops.append(target)
+                return min(stops) - position if stops else None
+
+            wall = line.rfind(1, 0, position)
+            for side in (before, after):
+                if side is not None:
+                    forced = side.rfind(b'\x00\x01', max(wall, 0), position)
+                    if forced >= 0: stops.append(forced + 1)
+            if wall < target < position: stops.append(target)
+            return position - max(stops) if stops else None
+
+        def jump(x: int, y: int, dx: int, dy: int) -> Tuple[int,int,int] | None:
+            if not dy and not wrapX:
+                above = rowLines[y - 1] if y or wrapY else None
+                below = rowLines[(y + 1) % rows] if y + 1 < rows or wrapY else None
+                steps = scan(rowLines[y], above, below, x, dx, goal[0] if goal[1] == y else -1)
+                return None if steps is None else (x + dx * steps, y, steps)
+            if not dx and colLines is not None:
+                left = colLines[x - 1] if x or wrapX else None
+                right = colLines[(x + 1) % cols] if x + 1 < cols or wrapX else None
+                steps = scan(colLines[x], left, right, y, dy, goal[1] if goal[0] == x else -1)
+                return None if steps is None else (x, y + dy * steps, steps)
+
+            limit = cols if not dy else rows if not dx else cols * rows
+            for steps in range(1, limit + 1):
+                x += dx
+                y += dy
+                if not free(x, y): return None
+                x %= cols
+                y %= rows
+                if (x,y) == goal: return x, y, steps
+                if dx and dy:
+                    if (free(x - dx, y + dy) and not free(x - dx, y)) or (free(x + dx, y - dy) and not free(x, y - dy)): return x, y, steps
+                    if jump(x, y, dx, 0) or jump(x, y, 0, dy): return x, y, steps
+                elif dx:
+                    if (free(x + dx, y + 1) and not free(x, y + 1)) or (free(x + dx, y - 1) and not free(x, y - 1)): return x, y, steps
+                elif (free(x + 1, y + dy) and not free(x + 1, y)) or (free(x - 1, y + dy) and not free(x - 1, y)):
+                    return x, y, steps
+            return None
+
+        def directions(x: int, y: int, arrival: Tuple[int,int] | None) -> list[Tuple[int,int]]:
+            if arrival is None: return list(_NEIGHBOR_OFFSETS[8])
+            dx, dy = arrival
+            if dx and dy:
+                found = [(0, dy), (dx, 0), (dx, dy)]
+                if not free(x - dx, y): found.append((-dx, dy))
+                if not free(x, y - dy): found.append((dx, -dy))
+            elif dx:
+                found = [(dx, 0)]
+                if not free(x, y + 1): found.append((dx, 1))
+                if not free(x, y - 1): found.append((dx, -1))
+            else:
+                found = [(0, dy)]
+                if not free(x + 1, y): found.append((1, dy))
+                if not free(x - 1, y): found.append((-1, dy))
+            return [(i, j) for i, j in found if free(x + i, y + j)]
+
+        startIndex = start[1] * cols + start[0]
+        goalIndex = goal[1] * cols + goal[0]
+        total = {startIndex: 0}
+        via = {startIndex: None}
+        settled = set()
+        heap = [(estimate(startIndex), 0, startIndex)]
+        while heap:
+            _, _, index = heappop(heap)
+            if index in settled: continue
+            settled.add(index)
+            if index == goalIndex: break
+
+            y, x = divmod(index, cols)
+            arrival = via[index][1:3] if via[index] else None
+            for dx, dy in directions(x, y, arrival):
+                found = jump(x, y, dx, dy)
+                if found is None: continue
+                jx, jy, steps = found
+                target = jy * cols + jx
+                if target in settled: continue
+                candidate = total[index] + steps * (root2 if dx and dy else 1)
+                if target not in total or candidate < total[target]:
+                    total[target] = candidate
+                    via[target] = (index, dx, dy, steps)
+                    remaining = estimate(target)
+                    heappush(heap, (candidate + remaining, remaining, target))
+
+        if stats is not None: stats['expanded'] = len(settled)
+        if goalIndex not in settled: return None, None
+
+        path = [goal]
+        index = goalIndex
+        while via[index]:
+            index, dx, dy, steps = via[index]
+            x, y = path[-1]
+            for _ in range(steps):
+                x = (x - dx) % cols
+                y = (y - dy) % rows
+                path.append((x,y))
+        path.reverse()
+        return path, total[goalIndex]
+
+    def astar(self, start: Tuple[int,int], goal: Tuple[int,int], cost=None, heuristic=None, connectivity: int = 4, stats: dict | None = None, jps: bool = False) -> Tuple[list[Tuple[int,int]] | None, float | None]:
+        """Cheapest path from start to goal with costs as in dijkstra, guided by heuristic ('manhattan', 'octile' or a callable),
+        by jump point search on uniform-cost 8-connected maps if jps. Returns (path, total cost), or (None, None) if unreachable"""
+
+        startIndex = self._startIndices(start)[0]
+        goalIndex = self._startIndices(goal)[0]
+        costs = self._stepCosts(cost)
+        if jps:
+            wall = {c: c is None or not math.isfinite(c) for c in set(costs)}
+            uniform = {c for c, blocked in wall.items() if not blocked}
+            if connectivity != 8:
+                warn("ERROR: Jump point search needs connectivity 8. Running plain A* instead.")
+            elif len(uniform) > 1:
+                warn("ERROR: Jump point search needs every passable cell to cost the same. Running plain A* instead.")
+            else:
+                blocked = bytearray(map(wall.__getitem__, costs))
+                path, total = self._jumpPointSearch(start, goal, blocked, self._heuristic(heuristic, goal, 8, 1), stats)
+                return path, None if total is None else total * (uniform.pop() if uniform else 1)
+        scale = min((c for c in costs if c is not None), default=0)
+        estimate = self._heuristic(heuristic, goal, connectivity, scale)
+
+        total, parent, reached = self._search([startIndex], goalIndex, costs, connectivity, estimate)
+        if stats is not None: stats['expanded'] = len(reached)
+        if not reached or reached[-1] != goalIndex: return None, None
+        return self.tracePath(_ParentMap(parent, reached, self._cols), goal), total[goalIndex]
+
+    def floodFill(self, xyPair: Tuple[int,int], data, match=None, connectivity: int = 4) -> int:
+        """Set data on every cell connected to xyPair whose data passes match (None matches the start cell's data),
+        wrapping around edges for wrapX/wrapY. Returns the number of cells filled"""
+
+        if connectivity not in _NEIGHBOR_OFFSETS: raise Exception("Invalid connectivity, expected 4 or 8")
+        if not isinstance(xyPair, tuple) or xyPair not in self._matrix:
+            warn("ERROR: Coordinate was out of range of matrix. No data updates completed.")
+            return 0
+
+        if match is None:
+            seed = self._matrix[xyPair]
+            match = lambda value: value == seed
+        cols = self._cols
+        rows = self._rows
+        spread = 1 if connectivity == 8 else 0
+        pending = bytearray(1 if match(value) else 0 for value in self._matrix.values())
+        stack = [xyPair[1] * cols + xyPair[0]]
+        filled = 0
+
+        try:
+            while stack:
+                index = stack.pop()
+                if not pending[index]: continue
+                y = index // cols
+                rowStart = y * cols
+                rowEnd = rowStart + cols
+                left = pending.rfind(0, rowStart, index) + 1 or rowStart
+                right = pending.find(0, index, rowEnd)
+                if right < 0: right = rowEnd
+                runs = [(left, right)]
+                if self._wrapX and left == rowStart and right < rowEnd:
+                    wrapped = pending.rfind(0, right, rowEnd) + 1
+                    if wrapped < rowEnd: runs.append((wrapped, rowEnd))
+                elif self._wrapX and right == rowEnd and left > rowStart:
+                    wrapped = pending.find(0, rowStart, left)
+                    if wrapped > rowStart: runs.append((rowStart, wrapped))
+
+                for start, end in runs:
+                    pending[start:end] = bytes(end - start)
+                    self._matrix.fillSpan(y, start - rowStart, end - rowStart, data)
+                    filled += end - start
+
+                for ny in (y - 1, y + 1):
+                    if not 0 <= ny < rows:
+                        if not self._wrapY: continue
+                        ny %= rows
+                    base = ny * cols
+                    for start, end in runs:
+                        spans, _ = self._axisSpans(start - rowStart - spread, end - start + 2 * spread, cols, self._wrapX)
+                        for x0, _, length in spans:
+                            stop = base + x0 + length
+                            seed = pending.find(1, base + x0, stop)
+                            while seed >= 0:
+                                stack.append(seed)
+                                seed = pending.find(0, seed, stop)
+                                if seed < 0: break
+                                seed = pending.find(1, seed, stop)
+        except Exception as e:
+            print(f'ERROR: {e}')
+
+        return filled
+
+    def labelComponents(self, connectivity: int = 4, background=None) -> Tuple[Array2D, dict]:
+        """Label connected regions of equal data, with 0 for cells equal to background (None labels every cell).
+        Returns a typed Array2D of labels numbered from 1 in row-major order and a dict of label: cell count"""
+
+        if connectivity not in _NEIGHBOR_OFFSETS: raise Exception("Invalid connectivity, expected 4 or 8")
+
+        cols = self._cols
+        rows = self._rows
+        values = list(self._matrix.values())
+        labels = [0] * (cols * rows)
+        parent = [0]
+
+        def find(label: int) -> int:
+            while parent[label] != label:
+                parent[label] = parent[parent[label]]
+                label = parent[label]
+            return label
+
+        def union(label: int, other: int) -> int:
+            label = find(label)
+            other = find(other)
+            if label == other: return label
+            if other < label: label, other = other, label
+            parent[other] = label
+            return label
+
+        diagonal = connectivity == 8
+        for y in range(rows):
+            for x in range(cols):
+                index = y * cols + x
+                value = values[index]
+                if background is not None and value == background: continue
+                earlier = [index - 1] if x else []
+                if y:
+                    earlier.append(index - cols)
+                    if diagonal:
+                        if x: earlier.append(index - cols - 1)
+                        if x + 1 < cols: earlier.append(index - cols + 1)
+                label = 0
+                for neighbor in earlier:
+                    if labels[neighbor] and values[neighbor] == value:
+                        label = union(label, labels[neighbor]) if label else labels[neighbor]
+                if not label:
+                    label = len(parent)
+                    parent.append(label)
+                labels[index] = label
+
+        if self._wrapX or self._wrapY:
+            offsets = _NEIGHBOR_OFFSETS[connectivity]
+            seam = set()
+            if self._wrapX: seam.update((x, y) for y in range(rows) for x in {0, cols - 1})
+            if self._wrapY: seam.update((x, y) for x in range(cols) for y in {0, rows - 1})
+            for x, y in seam:
+                index = y * cols + x
+                if not labels[index]: continue
+                for nx, ny in self._neighborsOf(x, y, offsets, self._wrapX, self._wrapY):
+                    neighbor = ny * cols + nx
+                    if (abs(nx - x) > 1 or abs(ny - y) > 1) and labels[neighbor] and values[neighbor] == values[index]:
+                        union(labels[index], labels[neighbor])
+
+        compact = {}
+        sizes = {}
+        for index, label in enumerate(labels):
+            if not label: continue
+            root = find(label)
+            if root not in compact: compact[root] = len(compact) + 1
+            label = labels[index] = compact[root]
+            sizes[label] = sizes.get(label, 0) + 1
+
+        grid = Array2D(cols, rows, 0, self._wrapX, self._wrapY, storage='typed', dtype='i')
+        grid._matrix.loadList(labels)
+        return grid, sizes
+
+    @staticmethod
+    def _squaredEnvelope(f: list, wrap: bool) -> list:
+        """One-dimensional squared Euclidean distance transform, min over q of (i - q)^2 + f[q], from the lower envelope
+        of parabolas (Felzenszwalb and Huttenlocher). A wrapped axis is solved over three copies of f, keeping the middle one"""
+
+        size = len(f)
+        values = f * 3 if wrap else f
+        offset = size if wrap else 0
+        hull = []
+        bounds = []
+        for q, value in enumerate(values):
+            if value == math.inf: continue
+            s = -math.inf
+            while hull:
+                p = hull[-1]
+                s = (value + q * q - values[p] - p * p) / (2 * (q - p))
+                if s > bounds[-1]: break
+                hull.pop()
+                bounds.pop()
+            if not hull: s = -math.inf
+            hull.append(q)
+            bounds.append(s)
+        if not hull: return f[:]
+
+        result = [0.0] * size
+        k = 0
+        last = len(bounds) - 1
+        for i in range(size):
+            q = i + offset
+            while k < last and bounds[k + 1] < q: k += 1
+            p = hull[k]
+            result[i] = (q - p) * (q - p) + values[p]
+        return result
+
+    def distanceTransform(self, sources, metric: str = 'manhattan') -> Array2D:
+        """Return a typed 'd' Array2D of each cell's 'manhattan', 'chebyshev' or 'euclidean' distance to the nearest
+        source: one (x, y), a list of them, or a callable on cell data. Wrapped axes measure the short way around"""
+
+        if metric not in ('manhattan', 'chebyshev', 'euclidean'):
+            raise Exception("Invalid metric, expected 'manhattan', 'chebyshev' or 'euclidean'")
+
+        cols = self._cols
+        rows = self._rows
+        wrapX = self._wrapX
+        wrapY = self._wrapY
+        distance = [math.inf] * (cols * rows)
+        if callable(sources):
+            for index, value in enumerate(self._matrix.values()):
+                if sources(value): distance[index] = 0.0
+        else:
+            for index in self._startIndices(sources):
+                distance[index] = 0.0
+
+        if metric == 'euclidean':
+            for x in range(cols):
+                distance[x::cols] = self._squaredEnvelope(distance[x::cols], wrapY)
+            for y in range(rows):
+                distance[y * cols:(y + 1) * cols] = self._squaredEnvelope(distance[y * cols:(y + 1) * cols], wrapX)
+            distance = [math.sqrt(d) for d in distance]
+        else:
+            above = (-1, 0, 1) if metric == 'chebyshev' else (0,)
+
+            def sweep(step: int) -> bool:
+                changed = False
+                for y in (range(rows) if step > 0 else range(rows - 1, -1, -1)):
+                    row = y * cols
+                    previous = y - step
+                    if not 0 <= previous < rows: previous = previous % rows * cols if wrapY else None
+                    else: previous *= cols
+                    for x in (range(cols) if step > 0 else range(cols - 1, -1, -1)):
+                        best = distance[row + x]
+                        if not best: continue
+                        i = x - step
+                        if 0 <= i < cols or wrapX:
+                            d = distance[row + i % cols] + 1
+                            if d < best: best = d
+                        if previous is not None:
+                            for dx in above:
+                                i = x + dx
+                                if 0 <= i < cols or wrapX:
+                                    d = distance[previous + i % cols] + 1
+                                    if d < best: best = d
+                        if best < distance[row + x]:
+                            distance[row + x] = best
+                            changed = True
+                return changed
+
+            while (sweep(1) | sweep(-1)) and (wrapX or wrapY): pass
+
+        grid = Array2D(cols, rows, 0, wrapX, wrapY, storage='typed', dtype='d')
+        grid._matrix.loadList(distance)
+        return grid
+
+    @staticmethod
+    def _parseRule(rule: str) -> Tuple[set[int], set[int]]:
+        """Parse a Life-like rule string such as 'B3/S23' into its sets of birth and survival neighbor counts"""
+
+        parts = {part[:1]: part[1:] for part in rule.upper().split('/')}
+        if sorted(parts) != ['B', 'S'] or not all(c in '012345678' for c in parts['B'] + parts['S']):
+            raise Exception("Invalid rule, expected a B/S rule string such as 'B3/S23'")
+        return {int(c) for c in parts['B']}, {int(c) for c in parts['S']}
+
+    def step(self, rule: str = 'B3/S23', generations: int = 1, alive=True, dead=False) -> int:
+        """Advance a Life-like rule such as 'B3/S23' by generations, cells equal to alive being live and changed cells
+        written back as alive or dead. Returns the number of cells written"""
+
+        births, survivals = self._parseRule(rule)
+        if generations < 0: raise Exception("Invalid generations, expected a count of at least 0")
+
+        cols = self._cols
+        rows = self._rows
+        wrapX = self._wrapX
+        wrapY = self._wrapY
+        born = []
+        died = []
+
+        if np is not None and self.storage == 'numpy':
+            buffer = self._matrix.rawBuffer()
+            cells = np.asarray(buffer) if buffer is not None else np.array(self._matrix.toList(), dtype=object).reshape(rows, cols)
+            original = state = np.asarray(cells == alive, dtype=bool)
+            birthTable = np.zeros(9, dtype=bool)
+            birthTable[list(births)] = True
+            survivalTable = np.zeros(9, dtype=bool)
+            survivalTable[list(survivals)] = True
+            counts = np.zeros((rows, cols), dtype=np.uint8)
+            for _ in range(generations):
+                padded = np.pad(state, ((1, 1), (0, 0)), mode='wrap' if wrapY else 'constant')
+                padded = np.pad(padded, ((0, 0), (1, 1)), mode='wrap' if wrapX else 'constant')
+                counts.fill(0)
+                for dy in range(3):
+                    for dx in range(3):
+                        if dx != 1 or dy != 1: counts += padded[dy:dy + rows, dx:dx + cols]
+                following = np.where(state, survivalTable[counts], birthTable[counts])
+                if np.array_equal(following, state): break
+                state = following
+            ys, xs = np.nonzero(state & ~original)
+            born = list(zip(xs.tolist(), ys.tolist()))
+            ys, xs = np.nonzero(original & ~state)
+            died = list(zip(xs.tolist(), ys.tolist()))
+        else:
+            mask = (1 << cols) - 1
+            top = cols - 1
+            values = self._matrix.toList()
+            original = [int(''.join(['1' if v == alive else '0' for v in reversed(values[y * cols:(y + 1) * cols])]), 2) for y in range(rows)]
+            current = original[:]
+            following = original[:]
+            wanted = births | survivals
+            dirty = range(rows)
+
+            for _ in range(generations):
+                todo = set()
+                for y in dirty:
+                    for j in (y - 1, y, y + 1):
+                        if 0 <= j < rows: todo.add(j)
+                        elif wrapY: todo.add(j % rows)
+                changed = []
+                for y in todo:
+                    row = current[y]
+                    up = current[y - 1] if y or wrapY else 0
+                    down = current[(y + 1) % rows] if y + 1 < rows or wrapY else 0
+                    if wrapX:
+                        planes = (up, ((up << 1) & mask) | (up >> top), (up >> 1) | ((up & 1) << top),
+                                  ((row << 1) & mask) | (row >> top), (row >> 1) | ((row & 1) << top),
+                                  down, ((down << 1) & mask) | (down >> top), (down >> 1) | ((down & 1) << top))
+                    else:
+                        planes = (up, (up << 1) & mask, up >> 1, (row << 1) & mask, row >> 1, down, (down << 1) & mask, down >> 1)
+                    b0 = b1 = b2 = b3 = 0
+                    for plane in planes:
+                        carry = b0 & plane
+                        b0 ^= plane
+                        plane = b1 & carry
+                        b1 ^= carry
+                        b3 |= b2 & plane
+                        b2 ^= plane
+                    birth = survival = 0
+                    for n in wanted:
+                        equal = (b0 if n & 1 else ~b0) & (b1 if n & 2 else ~b1) & (b2 if n & 4 else ~b2) & (b3 if n & 8 else ~b3)
+                        if n in births: birth |= equal
+                        if n in survivals: survival |= equal
+                    new = ((birth & ~row) | (survival & row)) & mask
+                    following[y] = new
+                    if new != row: changed.append(y)
+                current, following = following, current
+                dirty = changed
+                if not dirty: break
+
+            for y in range(rows):
+                row = current[y]
+                diff = original[y] ^ row
+                while diff:
+                    low = diff & -diff
+                    (born if row & low else died).append((low.bit_length() - 1, y))
+                    diff ^= low
+
+        try:
+            if born: self._matrix.setMany(born, alive)
+            if died: self._matrix.setMany(died, dead)
+        except Exception as e:
+            print(f'ERROR: {e}')
+        return len(born) + len(died)
+
+    def convolve(self, kernel: list[list[float]], boundary: str = 'wrap') -> Array2D:
+        """Return a typed 'd' Array2D of this numeric matrix convolved with kernel, a list of rows centered on
+        kernel[h // 2][w // 2]. Past the edges boundary 'wrap' follows wrapX/wrapY (else 0), 'clamp' repeats edges, 'zero' reads 0"""
+
+        if boundary not in ('wrap', 'clamp', 'zero'): raise Exception("Invalid boundary, expected 'wrap', 'clamp' or 'zero'")
+        if not kernel or not kernel[0] or any(len(row) != len(kernel[0]) for row in kernel):
+            raise Exception("Invalid kernel, expected a non-empty list of equal-length rows of numbers")
+
+        cols = self._cols
+        rows = self._rows
+        height = len(kernel)
+        width = len(kernel[0])
+        flipped = [[float(v) for v in reversed(row)] for row in reversed(kernel)]
+
+        def sources(size: int, before: int, after: int, wrap: bool) -> list[int | None]:
+            indices = []
+            for i in range(-before, size + after):
+                if 0 <= i < size: indices.append(i)
+                elif boundary == 'clamp': indices.append(min(max(i, 0), size - 1))
+                elif boundary == 'wrap' and wrap: indices.append(i % size)
+                else: indices.append(None)
+            return indices
+
+        values = [float(v) for v in self._matrix.toList()]
+        xs = sources(cols, width - 1 - width // 2, width // 2, self._wrapX)
+        zeros = [0.0] * len(xs)
+        padded = []
+        for j in sources(rows, height - 1 - height // 2, height // 2, self._wrapY):
+            if j is None:
+                padded.append(zeros)
+                continue
+            row = values[j * cols:(j + 1) * cols]
+            padded.append([0.0 if i is None else row[i] for i in xs])
+
+        pivotY, pivotX = max(((j, i) for j in range(height) for i in range(width)), key=lambda ji: abs(flipped[ji[0]][ji[1]]))
+        pivot = flipped[pivotY][pivotX]
+        columnFactors = [flipped[j][pivotX] / pivot for j in range(height)] if pivot else [0.0] * height
+        rowFactors = flipped[pivotY]
+        separable = all(abs(flipped[j][i] - columnFactors[j] * rowFactors[i]) <= 1e-12 * max(1.0, abs(flipped[j][i]))
+                        for j in range(height) for i in range(width))
+
+        result = []
+        if all(v == pivot for row in flipped for v in row):
+            table = PrefixSums._summedArea(padded)
+            for y in range(rows):
+                top = table[y]
+                bottom = table[y + height]
+                result.extend(pivot * (bottom[x + width] - bottom[x] - top[x + width] + top[x]) for x in range(cols))
+        elif separable:
+            passes = []
+            for row in padded:
+                line = [0.0] * cols
+                for i, factor in enumerate(rowFactors):
+                    if factor: line = [acc + factor * v for acc, v in zip(line, row[i:i + cols])]
+                passes.append(line)
+            for y in range(rows):
+                line = [0.0] * cols
+                for j, factor in enumerate(columnFactors):
+                    if factor: line = [acc + factor * v for acc, v in zip(line, passes[y + j])]
+                result.extend(line)
+        else:
+            for y in range(rows):
+                line = [0.0] * cols
+                for j in range(height):
+                    row = padded[y + j]
+                    for i, factor in enumerate(flipped[j]):
+                        if factor: line = [acc + factor * v for acc, v in zip(line, row[i:i + cols])]
+                result.extend(line)
+
+        grid = Array2D(cols, rows, 0, self._wrapX, self._wrapY, storage='typed', dtype='d')
+        grid._matrix.loadList(result)
+        return grid
+
+    def count(self, data) -> int:
+        """Return number of cells containing data, O(1) when the matrix is indexed"""
+
+        return self._matrix.count(data)
+
+    def first(self, data) -> Tuple[int,int] | None:
+        """Return coordinates of the first cell in row-major order containing data, None if no cell contains data"""
+
+        return self._matrix.first(data)
+
+    def _selection(self, cols: None | int | list[int], rows: None | int | list[int]) -> Tuple[list[int] | None, list[int] | None]:
+        """Normalize cols/rows selectors the way iterLocs takes them into in-range lists, or None for all"""
+
+        if isinstance(cols, int): cols = [cols]
+        if isinstance(rows, int): rows = [rows]
+        if not ((cols is None or isinstance(cols, list)) and (rows is None or isinstance(rows, list))):
+            raise Exception("Invalid argument type, expected int or list of ints for cols and rows.")
+
+        selection = []
+        for selected, size in ((cols, self._cols), (rows, self._rows)):
+            if selected is not None:
+                inRange = [i for i in selected if 0 <= i < size]
+                if len(inRange) != len(selected): warn("ERROR: At least one listed row/column was out of range of the source matrix. Using only coordinates within matrix bounds.")
+                selected = inRange
+            selection.append(selected)
+        return selection[0], selection[1]
+
+    def _aggregate(self, operation: str, cols, rows):
+        """Run a one-pass storage reduction over the cols/rows selection, None (with a warning) if nothing is selected"""
+
+        cols, rows = self._selection(cols, rows)
+        if cols == [] or rows == []:
+            warn("ERROR: No cells selected. Returning None.")
+            return None
+        return self._matrix.aggregate(operation, cols, rows)
+
+    def valueCounts(self, cols: None | int | list[int] = None, rows: None | int | list[int] = None) -> dict | None:
+        """Return dict of each value to the number of cells holding it, over the entire Array2D or the given cols/rows as in iterLocs"""
+
+        return self._aggregate('counts', cols, rows)
+
+    def sum(self, cols: None | int | list[int] = None, rows: None | int | list[int] = None):
+        """Return sum of all data, or of the given cols/rows as in iterLocs"""
+
+        return self._aggregate('sum', cols, rows)
+
+    def min(self, cols: None | int | list[int] = None, rows: None | int | list[int] = None):
+        """Return smallest data, or smallest in the given cols/rows as in iterLocs"""
+
+        return self._aggregate('min', cols, rows)
+
+    def max(self, cols: None | int | list[int] = None, rows: None | int | list[int] = None):
+        """Return largest data, or largest in the given cols/rows as in iterLocs"""
+
+        return self._aggregate('max', cols, rows)
+
+    def mean(self, cols: None | int | list[int] = None, rows: None | int | list[int] = None) -> float | None:
+        """Return mean of all data, or of the given cols/rows as in iterLocs"""
+
+        total = self.sum(cols, rows)
+        if total is None: return None
+        cols, rows = self._selection(cols, rows)
+        return total / ((self._cols if cols is None else len(cols)) * (self._rows if rows is None else len(rows)))
+
+    def _watched(self) -> _WatchedStorage:
+        """Return this matrix's storage wrapped for watching writes, wrapping it on first use"""
+
+        if isinstance(self._matrix, _ViewStorage): raise Exception("Views cannot be watched, build the index or live table on the parent matrix")
+        if not isinstance(self._matrix, _WatchedStorage): self._matrix = _WatchedStorage(self._matrix)
+        return self._matrix
+
+    def buildIndex(self) -> None:
+        """Keep an index from each (hashable) value to the cells holding it, updated on every write through this matrix
+        or its views, so findAny, count and first need not scan"""
+
+        matrix = self._watched()
+        if matrix.index: return
+        matrix.index = _ValueIndex(matrix.inner)
+        matrix.watchers.append(matrix.index)
+
+    def dropIndex(self) -> None:
+        """Stop maintaining the value index"""
+
+        if isinstance(self._matrix, _WatchedStorage) and self._matrix.index:
+            self._matrix.watchers.remove(self._matrix.index)
+            self._matrix.index = None
+
+    def prefixSums(self, live=False) -> PrefixSums:
+        """Return a summed-area table answering rectSum(x, y, w, h) in O(1). live = True keeps it up to date under
+        writes through this matrix or its views until dropPrefixSums"""
+
+        if not live: return PrefixSums(self._matrix, self._wrapX, self._wrapY)
+        matrix = self._watched()
+        sums = PrefixSums(matrix.inner, self._wrapX, self._wrapY, live=True)
+        matrix.watchers.append(sums)
+        return sums
+
+    def dropPrefixSums(self, sums: PrefixSums) -> None:
+        """Stop updating a live table returned by prefixSums"""
+
+        if isinstance(self._matrix, _WatchedStorage) and sums in self._matrix.watchers: self._matrix.watchers.remove(sums)
+
+    @property
+    def indexed(self) -> bool:
+        """Returns whether a value index is being maintained"""
+
+        return isinstance(self._matrix, _WatchedStorage) and self._matrix.index is not None
+    
+    def fill(self, data) -> None:
+        """Set every cell of the matrix to the given data"""
+
+        try:
+            self._matrix.fill(data)
+        except Exception as e:
+            print(f'ERROR: {e}')
+
+    @staticmethod
+    def _axisSpans(start: int, length: int, size: int, wrap: bool) -> Tuple[list[Tuple[int,int,int]], bool]:
+        """Split a run of length cells from start along an axis of the given size into (target start, offset into run, count)
+        pieces. Wrapped axes continue from 0 (at most size cells are kept), others are clipped. Also returns whether clipping happened"""
+
+        if wrap:
+            start %= size
+            length = min(length, size)
+            first = min(length, size - start)
+            spans = [(start, 0, first)]
+            if length > first: spans.append((0, first, length - first))
+            return spans, False
+
+        lo = max(start, 0)
+        hi = min(start + length, size)
+        spans = [(lo, lo - start, hi - lo)] if hi > lo else []
+        return spans, lo != start or hi != start + length
+
+    def fillRect(self, x: int, y: int, w: int, h: int, data) -> None:
+        """Set every cell of the w x h rectangle with top-left corner (x, y) to data, writing whole row spans at once.
+        The rectangle wraps around edges for wrapX/wrapY and is otherwise clipped to the matrix"""
+
+        if w < 1 or h < 1:
+            warn("ERROR: Rectangle width and height must be at least 1. No data updates completed.")
+            return
+
+        xSpans, xClipped = self._axisSpans(x, w, self._cols, self._wrapX)
+        ySpans, yClipped = self._axisSpans(y, h, self._rows, self._wrapY)
+        try:
+            for y0, _, rows in ySpans:
+                for j in range(y0, y0 + rows):
+                    for x0, _, cols in xSpans:
+                        self._matrix.fillSpan(j, x0, x0 + cols, data)
+        except Exception as e:
+            print(f'ERROR: {e}')
+
+        if xClipped or yClipped: warn("ERROR: Rectangle was partly out of range of the target matrix. Updating data only for coordinates within matrix bounds.")
+
+    def _root(self) -> Array2D:
+        """Return the matrix whose storage this one's data lives in, i.e. the parent of a view"""
+
+        return self._matrix.parent if isinstance(self._matrix, _ViewStorage) else self
+
+    def blit(self, src: Array2D, destXY: Tuple[int,int] = (0,0), srcRect: Tuple[int,int,int,int] | None = None) -> None:
+        """Copy the (x, y, w, h) rectangle srcRect of src (all of src if unspecified) onto this matrix with its top-left corner
+        at destXY, a row span at a time. Wraps around edges for wrapX/wrapY and is otherwise clipped to the matrix"""
+
+        if srcRect is None: srcRect = (0, 0, src.cols, src.rows)
+        sx, sy, w, h = srcRect
+        if sx < 0 or sy < 0 or w < 1 or h < 1 or sx + w > src.cols or sy + h > src.rows:
+            warn("ERROR: Source rectangle is empty or out of range of the source matrix. No data updates completed.")
+            return
+        if src._root() is self._root():
+            src = src[sy:sy + h, sx:sx + w].copy()
+            sx = sy = 0
+
+        xSpans, xClipped = self._axisSpans(destXY[0], w, self._cols, self._wrapX)
+        ySpans, yClipped = self._axisSpans(destXY[1], h, self._rows, self._wrapY)
+        try:
+            for y0, yOffset, rows in ySpans:
+                for k in range(rows):
+                    for x0, xOffset, cols in xSpans:
+                        start = sx + xOffset
+                        self._matrix.setSpan(y0 + k, x0, src._matrix.getSpan(sy + yOffset + k, start, start + cols))
+        except Exception as e:
+            print(f'ERROR: {e}')
+
+        if xClipped or yClipped: warn("ERROR: Copied rectangle was partly out of range of the target matrix. Updating data only for coordinates within matrix bounds.")
+
+    def flush(self) -> None:
+        """Write pending changes of file-backed storage to disk"""
+
+        self._matrix.flush()
+
+    def asPoint(self, xyPair: Tuple[int,int]) -> Point | None:
+        """Returns the requested coordinates as a full Point class"""
+
+        try:
+            return Point(xyPair,self._matrix[xyPair])
+        except KeyError:
+            warn("ERROR: Given coordinates are out of range. Returning None.")
+            return None
+
+    @property
+    def rows(self) -> int:
+        """Return number of rows in matrix"""
+
+        return self._rows 
+
+    @property
+    def cols(self) -> int:
+        """Return number of columns in matrix"""
+
+        return self._cols
+    
+    @property
+    def wrapX(self) -> bool:
+        """Returns whether matrix can wrap around for Point x-movement"""
+
+        return self._wrapX
+    
+    @property
+    def wrapY(self) -> bool:
+        """Returns whether matrix can wrap around for Point y-movement"""
+        
+        return self._wrapY
+
+    @property
+    def storage(self) -> str:
+        """Returns name of the storage backend holding the matrix data"""
+
+        return self._matrix.name
+
+    @property
+    def buffer(self) -> memoryview | None:
+        """Returns a zero-copy memoryview of the raw cell data for typed storage. Returns None for storage of Python objects"""
+
+        view = self._matrix.rawBuffer()
+        if view is None: warn("ERROR: This matrix's storage holds Python objects and has no raw buffer. Returning None.")
+        return view
+
+
+class BitArray2D(Array2D):
+    """Array2D of booleans packed one bit per cell, with popcount and whole-grid and/or/xor/not"""
+
+    def __init__(self, cols: int, rows: int, defaultData=False, wrapX=False, wrapY=False) -> None:
+        """Initialize a boolean 2D array with every cell set to bool(defaultData)"""
+
+        super().__init__(cols, rows, defaultData, wrapX, wrapY, storage='bits')
+
+    def __repr__(self) -> str:
+        """Basic data for debugging"""
+
+        return f'BitArray2D({self._rows}x{self._cols})'
+
+    def _packed(self) -> _BitStorage:
+        """Return the bit storage holding this grid's cells, a packed copy for views"""
+
+        return self.copy()._matrix if isinstance(self._matrix, _ViewStorage) else self._matrix
+
+    def popcount(self) -> int:
+        """Return number of True cells"""
+
+        return self._packed().popcount()
+
+    def _combine(self, other: BitArray2D, operation) -> BitArray2D:
+        """Apply an int operation to the packed bits of this and another same-sized BitArray2D"""
+
+        if not isinstance(other, BitArray2D) or other.cols != self._cols or other.rows != self._rows:
+            raise Exception("Bitwise operations need another BitArray2D of the same size")
+
+        value = operation(self._packed().toInt(), other._packed().toInt())
+        return BitArray2D._fromStorage(_BitStorage.fromInt(self._cols, self._rows, value), self._wrapX, self._wrapY)
+
+    def __and__(self, other: BitArray2D) -> BitArray2D:
+        """Cells True in both grids"""
+
+        return self._combine(other, int.__and__)
+
+    def __or__(self, other: BitArray2D) -> BitArray2D:
+        """Cells True in either grid"""
+
+        return self._combine(other, int.__or__)
+
+    def __xor__(self, other: BitArray2D) -> BitArray2D:
+        """Cells True in exactly one grid"""
+
+        return self._combine(other, int.__xor__)
+
+    def __invert__(self) -> BitArray2D:
+        """Cells False in this grid"""
+
+        value = self._packed().toInt() ^ ((1 << self._cols * self._rows) - 1)
+        return BitArray2D._fromStorage(_BitStorage.fromInt(self._cols, self._rows, value), self._wrapX, self._wrapY)
+
+class _QuadNode:
+    """Interned HashLife quadtree node, a square of 2^level cells split into four quadrants (leaves have level 0)"""
+
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'level', 'population')
+
+    def __init__(self, nw: _QuadNode | None, ne: _QuadNode | None, sw: _QuadNode | None, se: _QuadNode | None, level: int, population: int) -> None:
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+
+class HashLife:
+    """Unbounded Life-like universe of memoized quadtree nodes that advances 2^k generations per call.
+    Coordinates follow Array2D: origin top-left, y down (and may go negative)"""
+
+    def __init__(self, rule: str = 'B3/S23') -> None:
+        """Initialize an empty universe for a Life-like rule without B0"""
+
+        births, survivals = Array2D._parseRule(rule)
+        if 0 in births: raise Exception("HashLife needs a rule without B0, where empty space stays empty")
+
+        self._births = births
+        self._survivals = survivals
+        self._nodes = {}
+        self._empty = []
+        self._successors = {}
+        self._dead = _QuadNode(None, None, None, None, 0, 0)
+        self._alive = _QuadNode(None, None, None, None, 0, 1)
+        self._root = self._emptyNode(3)
+        self._x = 0
+        self._y = 0
+        self._generation = 0
+
+    def __repr__(self) -> str:
+        """Basic data for debugging"""
+
+        return f'HashLife(generation {self._generation}, population {self.population})'
+
+    @classmethod
+    def fromArray2D(cls, grid: Array2D, alive=True, rule: str = 'B3/S23') -> HashLife:
+        """Build a universe whose live cells are the cells of grid whose data equals alive, at the same coordinates.
+        The universe is unbounded, so wrapX/wrapY are ignored"""
+
+        if grid.wrapX or grid.wrapY: warn("ERROR: HashLife universes are unbounded. Ignoring wrapX/wrapY of the grid.")
+
+        life = cls(rule)
+        level = 3
+        while 1 << level < max(grid.cols, grid.rows): level += 1
+
+        cells = {coord: life._alive for coord in grid.findAny(alive)}
+        for k in range(1, level + 1):
+            empty = life._emptyNode(k - 1)
+            cells = {(x, y): life._join(cells.get((2 * x, 2 * y), empty), cells.get((2 * x + 1, 2 * y), empty),
+                                        cells.get((2 * x, 2 * y + 1), empty), cells.get((2 * x + 1, 2 * y + 1), empty))
+                     for x, y in {(x >> 1, y >> 1) for x, y in cells}}
+        life._root = cells.get((0, 0), life._emptyNode(level))
+        return life
+
+    def toArray2D(self, region: Tuple[int,int,int,int] | None = None, alive=True, dead=False, storage: str | None = None) -> Array2D | None:
+        """Return the (x, y, w, h) region of the universe as a w x h Array2D of alive and dead, its (0,0) being (x, y).
+        region defaults to bounds(). Returns None for an empty universe without a region"""
+
+        if region is None: region = self.bounds()
+        if region is None:
+            warn("ERROR: Universe has no live cells and no region was given. Returning None.")
+            return None
+
+        x, y, w, h = region
+        grid = Array2D(w, h, dead, storage=storage)
+        coords = [(i - x, j - y) for i, j in self.liveCells(region)]
+        if coords: grid.setData(coords, alive)
+        return grid
+
+    def liveCells(self, region: Tuple[int,int,int,int] | None = None):
+        """Yields (x, y) of every live cell, or of those in the (x, y, w, h) region, skipping empty quadrants"""
+
+        x0, y0, x1, y1 = (-math.inf, -math.inf, math.inf, math.inf) if region is None else (region[0], region[1], region[0] + region[2], region[1] + region[3])
+        stack = [(self._root, self._x, self._y)]
+        while stack:
+            node, x, y = stack.pop()
+            size = 1 << node.level
+            if not node.population or x >= x1 or y >= y1 or x + size <= x0 or y + size <= y0: continue
+            if not node.level:
+                yield x, y
+                continue
+            half = size >> 1
+            stack.extend(((node.se, x + half, y + half), (node.sw, x, y + half), (node.ne, x + half, y), (node.nw, x, y)))
+
+    def bounds(self) -> Tuple[int,int,int,int] | None:
+        """Return the (x, y, w, h) bounding rectangle of the live cells, None if there are none"""
+
+        xs = []
+        ys = []
+        for x, y in self.liveCells():
+            xs.append(x)
+            ys.append(y)
+        if not xs: return None
+        return min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1
+
+    def advance(self, k: int = 0) -> None:
+        """Advance the universe by 2^k generations in one memoized step"""
+
+        if k < 0: raise Exception("Invalid k, expected at least 0")
+
+        while self._root.level < k + 2 or not self._padded(): self._expand()
+        self._expand()
+        offset = 1 << (self._root.level - 2)
+        self._root = self._successor(self._root, k)
+        self._x += offset
+        self._y += offset
+        self._generation += 1 << k
+
+    @property
+    def population(self) -> int:
+        """Number of live cells"""
+
+        return self._root.population
+
+    @property
+    def generation(self) -> int:
+        """Number of generations advanced so far"""
+
+        return self._generation
+
+    def _join(self, nw: _QuadNode, ne: _QuadNode, sw: _QuadNode, se: _QuadNode) -> _QuadNode:
+        """Return the interned node with the given quadrants"""
+
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._nodes[key] = _QuadNode(nw, ne, sw, se, nw.level + 1, nw.population + ne.population + sw.population + se.population)
+        return node
+
+    def _emptyNode(self, level: int) -> _QuadNode:
+        """Return the interned node of the given level with no live cells"""
+
+        if not self._empty: self._empty.append(self._dead)
+        while len(self._empty) <= level:
+            empty = self._empty[-1]
+            self._empty.append(self._join(empty, empty, empty, empty))
+        return self._empty[level]
+
+    def _padded(self) -> bool:
+        """Whether every live cell of the root is inside its central half"""
+
+        root = self._root
+        return root.population == root.nw.se.population + root.ne.sw.population + root.sw.ne.population + root.se.nw.population
+
+    def _expand(self) -> None:
+        """Double the root's size keeping its cells centered"""
+
+        root = self._root
+        empty = self._emptyNode(root.level - 1)
+        self._root = self._join(self._join(empty, empty, empty, root.nw), self._join(empty, empty, root.ne, empty),
+                                self._join(empty, root.sw, empty, empty), self._join(root.se, empty, empty, empty))
+        half = 1 << (root.level - 1)
+        self._x -= half
+        self._y -= half
+
+    def _center(self, node: _QuadNode) -> _QuadNode:
+        """Return the central node one level down"""
+
+        return self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _step4x4(self, node: _QuadNode) -> _QuadNode:
+        """Return the central 2x2 of a level 2 node one generation later"""
+
+        cells = [[0] * 4 for _ in range(4)]
+        for qx, qy, quadrant in ((0, 0, node.nw), (2, 0, node.ne), (0, 2, node.sw), (2, 2, node.se)):
+            cells[qy][qx] = quadrant.nw.population
+            cells[qy][qx + 1] = quadrant.ne.population
+            cells[qy + 1][qx] = quadrant.sw.population
+            cells[qy + 1][qx + 1] = quadrant.se.population
+
+        def cell(x: int, y: int) -> _QuadNode:
+            count = sum(cells[j][i] for j in (y - 1, y, y + 1) for i in (x - 1, x, x + 1)) - cells[y][x]
+            return self._alive if count in (self._survivals if cells[y][x] else self._births) else self._dead
+
+        return self._join(cell(1, 1), cell(2, 1), cell(1, 2), cell(2, 2))
+
+    def _successor(self, node: _QuadNode, j: int) -> _QuadNode:
+        """Return the central node one level down, 2^j generations later (j at most level - 2), memoized. At full speed
+        (j = level - 2) both halves of the step recurse in time, otherwise the first half only re-centers"""
+
+        if not node.population: return node.nw
+        key = (node, j)
+        result = self._successors.get(key)
+        if result is not None: return result
+
+        if node.level == 2:
+            result = self._step4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            join = self._join
+            parts = [nw, join(nw.ne, ne.nw, nw.se, ne.sw), ne,
+                     join(nw.sw, nw.se, sw.nw, sw.ne), join(nw.se, ne.sw, sw.ne, se.nw), join(ne.sw, ne.se, se.nw, se.ne),
+                     sw, join(sw.ne, se.nw, sw.se, se.sw), se]
+            if j < node.level - 2:
+                c = [self._center(part) for part in parts]
+                step = j
+            else:
+                c = [self._successor(part, j - 1) for part in parts]
+                step = j - 1
+            result = join(self._successor(join(c[0], c[1], c[3], c[4]), step), self._successor(join(c[1], c[2], c[4], c[5]), step),
+                          self._successor(join(c[3], c[4], c[6], c[7]), step), self._successor(join(c[4], c[5], c[7], c[8]), step))
 
+        self._successors[key] = result
+        return result
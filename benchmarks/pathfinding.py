@@ -0,0 +1,85 @@
+"""
+Pathfinding benchmark
+=====================
+
+Compares Array2D.astar and Array2D.dijkstra with a naive A* written the usual way on top of
+the public API: a dict of costs keyed by (x, y), getData for every neighbor and Point.getMove
+for stepping, then compares node expansions of plain A* and jump point search on an open map.
+Run from the repository root with `python benchmarks/pathfinding.py`.
+"""
+
+import os
+import random
+import sys
+import time
+from heapq import heappop, heappush
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from array2D import Array2D, Direction, Point
+
+SIZE = 1000
+WALLS = 0.2
+
+def naiveAstar(grid: Array2D, start, goal):
+    """A* over (x, y) tuples with a dict of best costs, the way callers wrote it before Array2D.astar"""
+
+    best = {start: 0}
+    parents = {start: None}
+    heap = [(0, start)]
+    done = set()
+    while heap:
+        _, current = heappop(heap)
+        if current in done: continue
+        done.add(current)
+        if current == goal: break
+        point = Point(current)
+        for direction in Direction:
+            neighbor = point.getMove(direction)
+            if not (0 <= neighbor[0] < grid.cols and 0 <= neighbor[1] < grid.rows): continue
+            stepCost = grid.getData(neighbor)
+            if stepCost is None or neighbor in done: continue
+            candidate = best[current] + stepCost
+            if neighbor not in best or candidate < best[neighbor]:
+                best[neighbor] = candidate
+                parents[neighbor] = current
+                heappush(heap, (candidate + abs(neighbor[0] - goal[0]) + abs(neighbor[1] - goal[1]), neighbor))
+    return best.get(goal)
+
+def timed(label: str, function):
+    """Run function once, print how long it took and return its result"""
+
+    began = time.perf_counter()
+    result = function()
+    print(f'{label:<28}{time.perf_counter() - began:8.2f}s')
+    return result
+
+def main() -> None:
+    """Build a random terrain grid and time each implementation between opposite corners"""
+
+    random.seed(1)
+    grid = Array2D(SIZE, SIZE, 1, storage='dense')
+    for xyPair in grid.iterLocs():
+        grid.setData(xyPair, None if random.random() < WALLS else random.randint(1, 9))
+    start, goal = (0, 0), (SIZE - 1, SIZE - 1)
+    grid.setData([start, goal], 1)
+
+    print(f'{SIZE}x{SIZE} grid, {WALLS:.0%} walls, terrain costs 1-9, 4-connected')
+    naive = timed('naive dict-based A*', lambda: naiveAstar(grid, start, goal))
+    path, cost = timed('Array2D.astar', lambda: grid.astar(start, goal))
+    distances, _ = timed('Array2D.dijkstra to goal', lambda: grid.dijkstra(start, goal))
+    print(f'path costs: naive {naive}, astar {cost}, dijkstra {distances.getData(goal)}')
+
+    openMap = Array2D(SIZE, SIZE, 1, storage='dense')
+    for _ in range(SIZE // 10):
+        openMap.fillRect(random.randrange(SIZE - 30), random.randrange(SIZE - 30), random.randint(3, 30), random.randint(3, 30), None)
+    openMap.setData([start, goal], 1)
+
+    print(f'\n{SIZE}x{SIZE} open map with {SIZE // 10} rectangular walls, uniform cost, 8-connected')
+    for label, jps in (('Array2D.astar', False), ('Array2D.astar(jps=True)', True)):
+        stats = {}
+        _, cost = timed(label, lambda: openMap.astar(start, goal, connectivity=8, stats=stats, jps=jps))
+        print(f'{"":<28}{stats["expanded"]} cells expanded, path cost {cost:.2f}')
+
+if __name__ == '__main__':
+    main()